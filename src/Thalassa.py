@@ -1,3 +1,10 @@
+import sys
+
+if __name__ == "__main__" and len(sys.argv) > 1:
+    # Headless commands (replay, ...) don't need the GUI, so dispatch before importing it
+    from thalassa_core.cli import main
+    sys.exit(main(sys.argv[1:]))
+
 import tkinter as tk 
 import ttkbootstrap as ttk
 from tkinter import filedialog
@@ -10,10 +17,14 @@ import time
 
 from thalassa_core.configs import Configs, SearchEntry
 from thalassa_core.log_parser import LogParser
+from thalassa_core.log_tailer import LogTailer
+from thalassa_core.events import EventBus, GameEvent, FilterMatchEvent
 from thalassa_core.cursed_isles import CursedIsles
 from thalassa_core.chats_tab import ChatsTab
 from thalassa_core.options_tab import OptionsTab
 from thalassa_core.discord_bot import CIDiscordBot
+from thalassa_core.metrics import metrics
+from thalassa_core.metrics_exporter import MetricsExporter
 
 
 class ThalassaGUI:
@@ -24,7 +35,11 @@ class ThalassaGUI:
         self.bot_thread.start()
 
         self.configs = configs
-        self.log_parser = LogParser(self.handle_log_event, self.configs)
+        # The parser publishes events, they are delivered in one batch per tick
+        self.event_bus = EventBus()
+        self.event_bus.subscribe(GameEvent, self.handle_game_events, batch=True)
+        self.event_bus.subscribe(FilterMatchEvent, self.handle_filter_matches, batch=True)
+        self.log_parser = LogParser(self.event_bus.publish, self.configs)
         self.window = ttk.Window(themename="darkly")
         self.window.title("Thalassa")
         self.window.geometry(f"{self.configs.window_width}x{self.configs.window_height}+{self.configs.window_x}+{self.configs.window_y}")
@@ -40,7 +55,23 @@ class ThalassaGUI:
         self.tabs = {}
         self._create_tabs()
 
-        self._scan_files()
+        self.log_tailer = None
+        if self.configs.threaded_ingest:
+            self.log_tailer = LogTailer(self.log_parser, self.configs.ingest_queue_size)
+            self.log_tailer.start()
+            self._drain_events()
+        else:
+            self._watcher_registered = self._register_watcher()
+            self._scan_files()
+
+        self.metrics_exporter = None
+        if self.configs.metrics_exporter_on:
+            self.metrics_exporter = MetricsExporter(self.configs.metrics_exporter_port)
+            self.metrics_exporter.start()
+        self._loop_lag = metrics.histogram("tk_loop_lag")
+        self._last_loop_lag = 0.0
+        metrics.gauge("tk_loop_lag_last_seconds", lambda: self._last_loop_lag)
+        self._check_loop_lag(time.perf_counter_ns())
 
     def start_discord_bot(self):
         """This runs inside the separate thread"""
@@ -58,6 +89,17 @@ class ThalassaGUI:
         self.configs.window_x = self.window.winfo_x()
         self.configs.window_y = self.window.winfo_y()
         
+        if self.log_tailer:
+            # The tailer thread closes the parser itself, so nothing is closed while it is mid update
+            self.log_tailer.stop(close_parser=True)
+            self.log_tailer.join(timeout=1)
+            if self.log_tailer.is_alive():
+                print("Log tailer is still finishing an update, it will close the log parser when done")
+        else:
+            self.log_parser.close()
+        if self.metrics_exporter:
+            self.metrics_exporter.stop()
+
         # Save to file
         self.configs.save_configs()
         self.window.destroy()
@@ -90,20 +132,57 @@ class ThalassaGUI:
             self.current_mode_frame.pack(fill="both", expand=True)
 
 
-    def _scan_files(self):
+    def _update_logs(self):
         self.log_parser.update_all_logs()
-        self.window.after(50, self._scan_files)
-
+        self.event_bus.flush()
 
-    def handle_log_event(self, mode, data, *args, **kwargs):
-        # print(F"Handling log event: {mode = }, {data = }, {args = }, {kwargs = }")
-        """GUI responds to LogParser events."""
+    def _scan_files(self):
+        self._update_logs()
+        if self._watcher_registered:
+            # inotify wakes us through the file handler, this slow tick only picks up path changes
+            self.window.after(1000, self._scan_files)
+        else:
+            self.window.after(50, self._scan_files)
+
+    def _drain_events(self):
+        """Threaded ingestion: hand queued events to the GUI without spending more than the budget per tick."""
+        self.log_tailer.drain(self.event_bus.publish, self.configs.ingest_drain_budget_ms / 1000)
+        self.event_bus.flush()
+        self.window.after(50, self._drain_events)
+
+    def _check_loop_lag(self, expected_ns):
+        """How late Tk runs a callback is how long the GUI has been busy, e.g. with a burst of matches."""
+        lag = max(time.perf_counter_ns() - expected_ns, 0)
+        self._loop_lag.record(lag)
+        self._last_loop_lag = lag / 1e9
+        self.window.after(250, self._check_loop_lag, time.perf_counter_ns() + 250_000_000)
+
+    def _register_watcher(self):
+        """Lets Tk wake the parser as soon as the watcher has events, instead of polling."""
+        fd = self.log_parser.watcher.fileno()
+        if fd is None:
+            return False
+        try:
+            self.window.tk.createfilehandler(fd, tk.READABLE, lambda *args: self._update_logs())
+        except (AttributeError, tk.TclError) as error:
+            print(F"Could not register file watcher with Tk, polling instead: {error}")
+            return False
+        return True
+
+
+    def handle_game_events(self, events):
+        """GUI responds to a tick's worth of game log events."""
         if not self.current_mode_frame:
             print("No mode frame exists")
-        if mode == "Cursed Isles": #TODO Fix this
-            self.current_mode_frame.process_new_log_line(data)
-        if mode == "Filter Match":
-            self.chats_tab.update_output(data, *args, **kwargs)
+            return
+        cursed_isles_events = [event for event in events if event.mode == "Cursed Isles"] #TODO Fix this
+        if cursed_isles_events:
+            self.current_mode_frame.process_events(cursed_isles_events)
+
+    def handle_filter_matches(self, events):
+        """GUI responds to a tick's worth of chat filter matches."""
+        for event in events:
+            self.chats_tab.update_output(event.line, key=event.key, matches=event.matches, spans=event.spans, record=event.record)
 
 
     def handle_options_event(self, func, *args, **kwargs):
@@ -0,0 +1,179 @@
+from pathlib import Path
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+from thalassa_core.configs import Configs
+from thalassa_core.log_parser import LogParser
+from thalassa_core.chat_line import parse_chat_line
+from thalassa_core.synthetic_chat import SyntheticChat, filter_catalogue
+
+FILTER_COUNTS = (1, 10, 50, 100, 250, 500)
+MEMORY_SAMPLE = 2000  # Lines per case measured under tracemalloc, which is far too slow for the timed run
+
+
+class _Counter():
+    def __init__(self) -> None:
+        self.count = 0
+
+    def __call__(self, *args, **kwargs) -> None:
+        self.count += 1
+
+
+def _make_parser(filters: dict | None = None, memo_size: int | None = None) -> tuple[LogParser, _Counter]:
+    counter = _Counter()
+    configs = Configs(checkpoint_file=None)
+    if filters is not None:
+        configs.search_strings = filters
+    if memo_size is not None:
+        configs.trade_memo_size = memo_size
+    parser = LogParser(counter, configs)
+    parser.watcher.close() # Only the matching code is being measured
+    return parser, counter
+
+
+def _time(function, items, repeat: int, setup=None) -> float:
+    """Best of repeat runs, in seconds. setup is called before each run, untimed."""
+    best = None
+    for _ in range(repeat):
+        if setup:
+            setup()
+        started = time.perf_counter()
+        for item in items:
+            function(item)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def _peak_bytes(function, items, setup=None) -> float:
+    """Mean of the most memory each call had allocated at once, i.e. the garbage made per line."""
+    items = items[:MEMORY_SAMPLE]
+    if not items:
+        return 0.0
+    if setup:
+        setup()
+    total = 0
+    tracemalloc.start()
+    try:
+        for item in items:
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            function(item)
+            total += tracemalloc.get_traced_memory()[1] - before
+    finally:
+        tracemalloc.stop()
+    return total / len(items)
+
+
+def _measure(name: str, function, items, repeat: int, setup=None, **extra) -> dict:
+    if items:
+        function(items[0]) # Build anything made lazily, e.g. the filter plan, before timing
+    seconds = _time(function, items, repeat, setup)
+    result = {
+        "name": name,
+        **extra,
+        "lines": len(items),
+        "seconds": round(seconds, 6),
+        "lines_per_sec": round(len(items) / seconds, 1) if seconds else None,
+        "peak_bytes_per_line": round(_peak_bytes(function, items, setup), 1),
+    }
+    print(F"{name:30} {extra.get('filters', ''):>5} {result['lines_per_sec'] or 0:>14,.0f} lines/s {result['peak_bytes_per_line']:>10,.0f} B/line", file=sys.stderr)
+    return result
+
+
+def run_benchmarks(lines: int = 50000, seed: int = 0, filter_counts=FILTER_COUNTS, repeat: int = 3) -> dict:
+    """Runs every benchmark over the same generated lines and returns the results."""
+    chat = SyntheticChat(seed)
+    chat_lines = list(chat.lines(lines))
+    results = []
+
+    for count in filter_counts:
+        # Without the trade memo, comparable across filter counts and with runs from before it existed
+        parser, counter = _make_parser(filter_catalogue(count, seed), memo_size=0)
+        for line in chat_lines:
+            parser.apply_custom_chatlog_filters(line)
+        matches = counter.count
+        results.append(_measure("apply_custom_chatlog_filters", parser.apply_custom_chatlog_filters, chat_lines, repeat,
+                                filters=count, matches=matches))
+
+        # With it, starting cold every run so no run gets hits from the one before
+        parser, _ = _make_parser(filter_catalogue(count, seed))
+        memo = parser.trade_memo
+        def cold_memo():
+            memo.clear()
+            memo.hits = memo.misses = 0
+        cold_memo()
+        for line in chat_lines:
+            parser.apply_custom_chatlog_filters(line)
+        hit_rate = memo.stats()["hit_rate"]
+        results.append(_measure("apply_custom_chatlog_filters_memo", parser.apply_custom_chatlog_filters, chat_lines, repeat,
+                                setup=cold_memo, filters=count, memo_hit_rate=round(hit_rate, 4)))
+
+    parser, _ = _make_parser()
+    bodies = [record.body_lower for record in map(parse_chat_line, chat_lines) if record.channel == "trade"]
+    results.append(_measure("split_buy_and_sell", parser.split_buy_and_sell, bodies, repeat))
+    results.append(_measure("parse_chat_line", parse_chat_line, chat_lines, repeat))
+
+    patterns = [pattern for pattern, _ in parser.LOG_EVENT_PATTERNS]
+    game_lines = list(chat.game_lines(lines, patterns))
+    results.append(_measure("event_matcher", parser.event_matcher.matched_payloads, game_lines, repeat))
+
+    return {
+        "version": 1,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": seed,
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def _result_key(result: dict) -> tuple:
+    return (result["name"], result.get("filters"))
+
+
+def compare(report: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Describes every result more than tolerance (a fraction) slower than the baseline."""
+    baseline_results = {_result_key(result): result for result in baseline.get("results", [])}
+    regressions = []
+    for result in report["results"]:
+        old = baseline_results.get(_result_key(result))
+        if not old or not old.get("lines_per_sec") or not result["lines_per_sec"]:
+            continue
+        change = result["lines_per_sec"] / old["lines_per_sec"] - 1
+        if change < -tolerance:
+            filters = F" with {result['filters']} filters" if result.get("filters") else ""
+            regressions.append(F"{result['name']}{filters}: {old['lines_per_sec']:,.0f} -> {result['lines_per_sec']:,.0f} lines/s ({change:+.0%})")
+    return regressions
+
+
+def add_arguments(parser) -> None:
+    parser.add_argument("--lines", type=int, default=50000, help="Number of synthetic lines per benchmark")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the synthetic chat and filters")
+    parser.add_argument("--filters", type=int, nargs="+", default=list(FILTER_COUNTS), help="Filter counts to benchmark")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per benchmark, the best is kept")
+    parser.add_argument("--output", type=Path, default=Path("benchmark.json"), help="Where to write the results")
+    parser.add_argument("--baseline", type=Path, default=None, help="Earlier results to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="How much slower than the baseline counts as a regression")
+
+
+def run(args) -> int:
+    """Benchmark the filter hot path, e.g.
+    uv run src/Thalassa.py bench --output after.json --baseline before.json
+    Exits with 1 if anything got slower than the baseline by more than the tolerance."""
+    report = run_benchmarks(args.lines, args.seed, args.filters, args.repeat)
+    with args.output.open("w", encoding="utf-8") as fh:
+        json.dump(report, fh, indent=2)
+    print(F"Results written to {args.output}", file=sys.stderr)
+
+    if args.baseline:
+        with args.baseline.open("r", encoding="utf-8") as fh:
+            regressions = compare(report, json.load(fh), args.tolerance)
+        for regression in regressions:
+            print(F"Regression: {regression}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
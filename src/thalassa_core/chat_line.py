@@ -0,0 +1,45 @@
+class ChatLine():
+    """A chatlog line split into its parts once, so filters never have to re-split it.
+
+    A normal line looks like: [19:20:11] Jice trade chats, "selling ci map"
+    Lines that don't start with a timestamp are the rest of a multi-line message."""
+    __slots__ = ("line", "lower", "timestamp", "speaker", "channel", "body", "body_lower", "body_start", "continuation")
+
+    def __init__(self, line: str, lower: str, timestamp: str | None, speaker: str | None,
+                 channel: str | None, body: str, body_lower: str, body_start: int, continuation: bool) -> None:
+        self.line = line
+        self.lower = lower
+        self.timestamp = timestamp
+        self.speaker = speaker
+        self.channel = channel  # Third word of the lowercased line, e.g. "trade", "crew", "says,"
+        self.body = body
+        self.body_lower = body_lower
+        self.body_start = body_start  # Offset of the body within line, for turning body offsets into line offsets
+        self.continuation = continuation
+
+    def __repr__(self) -> str:
+        return F"ChatLine({self.line!r})"
+
+
+def parse_chat_line(line: str) -> ChatLine:
+    """Splits a raw chatlog line into a ChatLine."""
+    lower = line.lower()
+    words = lower.split(" ", 3)
+    channel = words[2] if len(words) > 2 else None
+
+    if not line.startswith("[") or "] " not in line:
+        return ChatLine(line, lower, None, None, channel, line, lower, 0, True)
+
+    timestamp, rest = line[1:].split("] ", 1)
+    rest_start = len(timestamp) + 3
+    speaker = rest.split(" ", 1)[0]
+
+    # The message follows the first ", " e.g. 'Jice trade chats, "selling ci map"'
+    comma = rest.find(", ")
+    body_start = rest_start + (comma + 2 if comma != -1 else len(speaker) + 1)
+    body = line[body_start:]
+    if len(body) > 1 and body[0] == '"' and body[-1] == '"':
+        body = body[1:-1]
+        body_start += 1
+
+    return ChatLine(line, lower, timestamp, speaker, channel, body, body.lower(), body_start, False)
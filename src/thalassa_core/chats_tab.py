@@ -1,18 +1,21 @@
 import tkinter as tk 
 import ttkbootstrap as ttk
 from tkinter import filedialog
-import pygame.mixer as mixer
-from pathlib import Path
 import asyncio
 
 from thalassa_core.configs import SearchEntry
 from thalassa_core.tkinter_widgets import ScrollableFrame
 from thalassa_core.discord_bot import CIDiscordBot
+from thalassa_core.metrics import metrics
+from thalassa_core.forwarding import discord_message_for
+from thalassa_core.repost_cooldown import RepostCooldown
+from thalassa_core.sound_service import sounds
 
 
 class FiltersTab:
-    def __init__(self, parent, search_strings):
+    def __init__(self, parent, search_strings, on_change=None):
         self.search_strings = search_strings
+        self.on_change = on_change # Called after any filter is added, edited or deleted
         self.frame = ttk.Frame(parent)
         self.frame.pack(fill="both", expand=True)
         
@@ -27,6 +30,17 @@ class FiltersTab:
         add_btn = ttk.Button(self.frame, text="Add New Filter", command=self.add_new_filter)
         add_btn.pack(side="bottom", pady=10)
 
+    def _update_setting(self, settings, attribute, value):
+        """Write a GUI change back to the SearchEntry and let the parser know the filters changed."""
+        if getattr(settings, attribute) == value:
+            return
+        setattr(settings, attribute, value)
+        self._notify_change()
+
+    def _notify_change(self):
+        if self.on_change:
+            self.on_change()
+
     def create_filter_widgets(self, parent, settings, number):
         entry_frame = ttk.Frame(parent, relief="groove", padding=5)
         entry_frame.pack(fill="x", pady=5)
@@ -45,7 +59,7 @@ class FiltersTab:
         # Name Variable
         gui_vars['name'] = tk.StringVar(value=settings.name)
         # Sync: When GUI changes -> Update Settings Object
-        gui_vars['name'].trace_add("write", lambda *a: setattr(settings, 'name', gui_vars['name'].get()))
+        gui_vars['name'].trace_add("write", lambda *a: self._update_setting(settings, 'name', gui_vars['name'].get()))
 
         # Editable name label
         name_label = ttk.Label(header_frame, textvariable=gui_vars['name'], font=("TkDefaultFont", 10, "bold"))
@@ -77,8 +91,8 @@ class FiltersTab:
         gui_vars['muted'] = tk.BooleanVar(value=settings.muted)
 
         # Sync checkboxes
-        gui_vars['on'].trace_add("write", lambda *a: setattr(settings, 'on_off', gui_vars['on'].get()))
-        gui_vars['muted'].trace_add("write", lambda *a: setattr(settings, 'muted', gui_vars['muted'].get()))
+        gui_vars['on'].trace_add("write", lambda *a: self._update_setting(settings, 'on_off', gui_vars['on'].get()))
+        gui_vars['muted'].trace_add("write", lambda *a: self._update_setting(settings, 'muted', gui_vars['muted'].get()))
 
         ttk.Checkbutton(inline_frame, text="On", variable=gui_vars['on']).pack(side="left", padx=5)
         ttk.Checkbutton(inline_frame, text="Muted", variable=gui_vars['muted']).pack(side="left", padx=5)
@@ -90,14 +104,14 @@ class FiltersTab:
         # 1. Channel
         ttk.Label(advanced_frame, text="Channel:").pack(anchor="w")
         gui_vars['channel'] = tk.StringVar(value=settings.channel)
-        gui_vars['channel'].trace_add("write", lambda *a: setattr(settings, 'channel', gui_vars['channel'].get()))
+        gui_vars['channel'].trace_add("write", lambda *a: self._update_setting(settings, 'channel', gui_vars['channel'].get()))
         
         channel_entry = ttk.Entry(advanced_frame, textvariable=gui_vars['channel'])
         channel_entry.pack(fill="x", pady=2)
 
         # 2. Buy/Sell
         gui_vars['buy_sell'] = tk.StringVar(value=settings.buy_or_sell)
-        gui_vars['buy_sell'].trace_add("write", lambda *a: setattr(settings, 'buy_or_sell', gui_vars['buy_sell'].get()))
+        gui_vars['buy_sell'].trace_add("write", lambda *a: self._update_setting(settings, 'buy_or_sell', gui_vars['buy_sell'].get()))
 
         buy_sell_frame = ttk.Frame(advanced_frame)
         buy_sell_frame.pack(fill="x")
@@ -109,7 +123,7 @@ class FiltersTab:
         string_regex_frame = ttk.Frame(advanced_frame)
         
         gui_vars['search_type'] = tk.StringVar(value=settings.string_or_regex)
-        gui_vars['search_type'].trace_add("write", lambda *a: setattr(settings, 'string_or_regex', gui_vars['search_type'].get()))
+        gui_vars['search_type'].trace_add("write", lambda *a: self._update_setting(settings, 'string_or_regex', gui_vars['search_type'].get()))
 
         string_regex_options = ["Strings", "Regex"]
         string_regex_dropdown = ttk.Combobox(string_regex_frame, textvariable=gui_vars['search_type'], values=string_regex_options, state="readonly")
@@ -120,11 +134,11 @@ class FiltersTab:
         # We bind directly to KeyRelease to update settings.
         strings_text = tk.Text(string_regex_frame, height=3)
         strings_text.insert("1.0", settings.strings)
-        strings_text.bind("<KeyRelease>", lambda e: setattr(settings, 'strings', strings_text.get("1.0", "end-1c")))
+        strings_text.bind("<KeyRelease>", lambda e: self._update_setting(settings, 'strings', strings_text.get("1.0", "end-1c")))
 
         regex_text = tk.Text(string_regex_frame, height=3)
         regex_text.insert("1.0", settings.regex)
-        regex_text.bind("<KeyRelease>", lambda e: setattr(settings, 'regex', regex_text.get("1.0", "end-1c")))
+        regex_text.bind("<KeyRelease>", lambda e: self._update_setting(settings, 'regex', regex_text.get("1.0", "end-1c")))
 
         string_regex_frame.pack(fill="x", pady=2)
         string_regex_dropdown.pack(anchor="w", pady=2)
@@ -132,7 +146,7 @@ class FiltersTab:
         # 4. Sound
         ttk.Label(advanced_frame, text="Sound:").pack(anchor="w")
         gui_vars['sound'] = tk.StringVar(value=settings.sound)
-        gui_vars['sound'].trace_add("write", lambda *a: setattr(settings, 'sound', gui_vars['sound'].get()))
+        gui_vars['sound'].trace_add("write", lambda *a: self._update_setting(settings, 'sound', gui_vars['sound'].get()))
 
         sound_frame = ttk.Frame(advanced_frame)
         sound_frame.pack(fill="x", pady=2)
@@ -189,6 +203,7 @@ class FiltersTab:
             # Remove from data model
             if num_to_delete in self.search_strings:
                 del self.search_strings[num_to_delete]
+                self._notify_change()
             
             # Remove frames
             if num_to_delete in self.filter_frames:
@@ -223,6 +238,7 @@ class FiltersTab:
         settings = SearchEntry(name=f"Filter {new_number}") 
         settings.is_new = True 
         self.search_strings[new_number] = settings
+        self._notify_change()
         self.create_filter_widgets(self.frame, settings, new_number)
 
 
@@ -239,8 +255,9 @@ class ChatsTab(ttk.Frame):
         self.configs = configs
         self.ci_discord_bot = ci_discord_bot
         self.chats_frame = chats_frame
+        self.repost_cooldown = RepostCooldown(configs)
 
-        mixer.init()
+        sounds.start(configs)
 
         self.output_text = []
         
@@ -288,7 +305,7 @@ class ChatsTab(ttk.Frame):
         scrollable_filters.pack(fill="both", expand=True)
 
         # Pass the inner frame to FiltersTab
-        FiltersTab(scrollable_filters.scroll_frame, self.configs.search_strings)
+        FiltersTab(scrollable_filters.scroll_frame, self.configs.search_strings, self._filters_changed)
 
         # Populate the Output tab
         output_frame = self.tabs["Output"]
@@ -297,19 +314,24 @@ class ChatsTab(ttk.Frame):
         scrollable_output = ScrollableFrame(output_frame)
         scrollable_output.pack(fill="both", expand=True)
 
-    def update_output(self, text: str, *args, key: str | None=None, **kwargs):
+    def _filters_changed(self):
+        self.configs.bump_filters_revision()
+        # Decode a newly picked filter sound now, not when its first alert goes off
+        sounds.refresh()
+
+    def update_output(self, text: str, *args, key: str | None=None, record=None, **kwargs):
         print()
         if key == None:
             return
+        if not self.repost_cooldown.should_alert(key, text, record):
+            return # Same trader, same message, already alerted on
         
-        if self.configs.search_strings[key].name == "Buying CI Map":
-            if "] " in text:
-                cleaned_text = text.split("] ", 1)[1]
-            else:
-                cleaned_text = text
-            self.ci_discord_bot.send_trade_from_external(cleaned_text)
-        
-        self._play_filter_sound(key)        
+        with metrics.histogram("update_output").time():
+            discord_message = discord_message_for(self.configs, key, text)
+            if discord_message is not None:
+                self.ci_discord_bot.send_trade_from_external(discord_message)
+            
+            self._play_filter_sound(key)        
 
     def _play_filter_sound(self, key: str):
         """Checks if a sound attached to a filter ought to play"""
@@ -324,17 +346,4 @@ class ChatsTab(ttk.Frame):
 
 
     def _play_sound(self, sound):
-        #TODO Build out functionality here.
-        try:
-            base_dir = Path(__file__).resolve().parent.parent
-            sound_path = base_dir / "media" / "sounds" / sound
-
-            if not sound_path.exists():
-                print(f"Sound file not found: {sound_path}")
-                return
-
-            mixer.music.load(str(sound_path))
-            mixer.music.play()
-
-        except Exception as e:
-            print(f"Warning sound failed to play! {e}")
\ No newline at end of file
+        sounds.play(sound, source="chat")
\ No newline at end of file
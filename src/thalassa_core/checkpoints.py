@@ -0,0 +1,101 @@
+from pathlib import Path
+import json
+import os
+import time
+
+
+def file_key(stat: os.stat_result) -> str:
+    """Identifies a file by device and inode, so a replaced file with the same name is a different file."""
+    return F"{stat.st_dev}:{stat.st_ino}"
+
+
+class OffsetCheckpoints():
+    """Remembers how far into each log file has been read, so a restart resumes where it left off.
+
+    Saved as JSON, at most once every min_interval seconds, by writing a temporary file,
+    fsyncing it and renaming it over the old one so a crash never leaves a half written file."""
+    def __init__(self, path: Path | None, min_interval: float = 2.0) -> None:
+        self.path = Path(path) if path else None
+        self.min_interval = min_interval
+        self.entries: dict[str, dict] = {}  # file_key -> {"name": filename, "offset": bytes read}
+        self._dirty = False
+        self._last_save = 0.0
+        self._names: set[str] | None = None
+        self._seen: set[str] = set()  # Keys looked up or set since loading, see prune_unseen
+        self.load()
+
+    def load(self) -> None:
+        if self.path is None or not self.path.exists():
+            return
+        try:
+            with self.path.open("r", encoding="utf-8") as fh:
+                self.entries = json.load(fh)
+        except (OSError, ValueError) as error:
+            print(F"Failed to load log checkpoints: {error}")
+            self.entries = {}
+        self._names = None
+
+    def get(self, key: str, name: str, size: int | None = None) -> int | None:
+        """The offset to resume name from, None if there isn't a usable one. Inodes get reused once the game
+        deletes old logs, so an entry only counts if it was saved under the same name and isn't past the end of the file."""
+        entry = self.entries.get(key)
+        if not entry or entry["name"] != name:
+            return None
+        if size is not None and entry["offset"] > size:
+            return None
+        self._seen.add(key)
+        return entry["offset"]
+
+    def has_name(self, name: str) -> bool:
+        """True if some file with this name has been read before, whatever its inode was."""
+        if self._names is None:
+            self._names = {entry["name"] for entry in self.entries.values()}
+        return name in self._names
+
+    def set(self, key: str, name: str, offset: int) -> None:
+        entry = self.entries.get(key)
+        if entry and entry["offset"] == offset and entry["name"] == name:
+            return
+        self.entries[key] = {"name": name, "offset": offset}
+        self._seen.add(key)
+        self._dirty = True
+        if self._names is not None:
+            self._names.add(name)
+
+    def forget(self, key: str) -> None:
+        if self.entries.pop(key, None) is not None:
+            self._dirty = True
+            self._names = None
+
+    def prune_unseen(self) -> None:
+        """Drop the entries for files that weren't found since loading, called once every directory has been
+        scanned so the file doesn't keep growing with logs that are long gone."""
+        stale = [key for key in self.entries if key not in self._seen]
+        for key in stale:
+            del self.entries[key]
+        if stale:
+            self._dirty = True
+            self._names = None
+
+    def maybe_save(self) -> None:
+        """Save if anything has changed and the last save was long enough ago."""
+        if self._dirty and time.monotonic() - self._last_save >= self.min_interval:
+            self.save()
+
+    def save(self) -> None:
+        if self.path is None or not self._dirty:
+            return
+        self._dirty = False
+        self._last_save = time.monotonic()
+
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with tmp_path.open("w", encoding="utf-8") as fh:
+                json.dump(dict(self.entries), fh)
+                fh.flush()
+                os.fsync(fh.fileno())
+            os.replace(tmp_path, self.path)
+        except OSError as error:
+            print(F"Failed to save log checkpoints: {error}")
+            self._dirty = True
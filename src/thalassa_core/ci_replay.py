@@ -0,0 +1,178 @@
+from contextlib import redirect_stdout
+from datetime import datetime
+from pathlib import Path
+import json
+import os
+import re
+import sys
+import time
+
+from thalassa_core.clock import ManualClock
+from thalassa_core.configs import Configs
+
+LOG_NAME_PATTERN = re.compile(r"yohoho_.*\.log")
+TIMESTAMP_PATTERN = re.compile(r"(\d{4}/\d\d/\d\d \d\d:\d\d:\d\d):(\d{3}) ")
+
+
+class TimestampParser():
+    """Turns the "2025/11/25 19:20:11:789" at the start of a yohoho log line into epoch seconds.
+    Consecutive lines nearly always share the same second, so the last one is cached."""
+    def __init__(self) -> None:
+        self._last_second = None
+        self._last_epoch = 0.0
+
+    def parse(self, line: str) -> float | None:
+        match = TIMESTAMP_PATTERN.match(line)
+        if match is None:
+            return None
+        second, millis = match.groups()
+        if second != self._last_second:
+            self._last_epoch = datetime.strptime(second, "%Y/%m/%d %H:%M:%S").timestamp()
+            self._last_second = second
+        return self._last_epoch + int(millis) / 1000
+
+
+def find_logs(paths: list[Path]) -> list[Path]:
+    """Expands directories into the yohoho logs inside them, oldest first."""
+    files = []
+    for path in paths:
+        if path.is_dir():
+            files.extend(child for child in path.iterdir() if child.is_file() and LOG_NAME_PATTERN.fullmatch(child.name))
+        elif path.is_file():
+            files.append(path)
+        else:
+            print(F"Skipping {path}, it does not exist", file=sys.stderr)
+    # Names are yohoho_<epoch ms>.log, all the same length, so sorting by name sorts by age
+    return sorted(files, key=lambda path: (len(path.name), path.name))
+
+
+def ci_state(ci) -> dict:
+    """The parts of the Cursed Isles state machine worth comparing between runs."""
+    return {
+        "ci_in_progress": ci.ci_in_progress,
+        "current_fray": ci.current_fray,
+        "rumble_active": ci.rumble_active,
+        "sf_active": ci.sf_active,
+        "forage_active": ci.forage_active,
+        "timer_running": ci.timer.running,
+        "timer_uses_duration": ci.timer.using_duration,
+        "timer_warning_played": ci.timer.warning_played,
+        "team": sorted(ci.team),
+        "thralls": ci.thralls,
+        "allies": dict(ci.ally_counts),
+        "enemies": dict(ci.enemy_counts),
+    }
+
+
+class CIReplay():
+    """Feeds yohoho logs through a CursedIsles frame on a ManualClock, so timers, the rumble display
+    and the forage timeout all follow the log timestamps instead of the wall clock.
+    Every change of state is written to output as a JSON line."""
+    def __init__(self, configs: Configs, output, speed: float = 0.0) -> None:
+        # Imported here so the rest of the cli doesn't need Tk or pygame
+        os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+        import ttkbootstrap as ttk
+        from thalassa_core.cursed_isles import CursedIsles
+
+        self.configs = configs
+        self.output = output
+        self.speed = speed  # Log seconds per real second, 0 runs as fast as possible
+        self.clock: ManualClock | None = None
+        self.timestamps = TimestampParser()
+
+        self.root = ttk.Window(themename="darkly")
+        self.root.withdraw()
+        self.ci_frame = ttk.Frame(self.root)
+        self._cursed_isles = CursedIsles
+        self.ci = None
+        self.transitions = 0
+        self._last_state = None
+
+    def _record(self, event: str, path: Path | None = None, line_number: int | None = None) -> None:
+        state = ci_state(self.ci)
+        if state == self._last_state:
+            return
+        self._last_state = state
+        self.transitions += 1
+        self.output.write(json.dumps({
+            "time": round(self.clock.now(), 3),
+            "event": event,
+            "file": str(path) if path else None,
+            "line": line_number,
+            "state": state,
+        }) + "\n")
+
+    def _advance_to(self, timestamp: float) -> None:
+        """Runs the scheduled callbacks one at a time so a state change made by a timer is seen as its own step."""
+        if self.speed > 0:
+            time.sleep(max(timestamp - self.clock.now(), 0.0) / self.speed)
+        while (due := self.clock.next_due()) is not None and due <= timestamp:
+            self.clock.advance_to(due)
+            self._record("clock")
+        self.clock.advance_to(timestamp)
+
+    def replay_file(self, path: Path) -> int:
+        """Returns the number of lines read."""
+        line_count = 0
+        with path.open("r", encoding="utf-8", errors="replace") as fh:
+            for line_count, line in enumerate(fh, start=1):
+                timestamp = self.timestamps.parse(line)
+                if timestamp is None:
+                    continue # Stack traces and other continuation lines
+                if self.clock is None:
+                    self.clock = ManualClock(timestamp)
+                    self.ci = self._cursed_isles(self.ci_frame, self.configs, self.clock)
+                    self._record("start", path, line_count)
+                self._advance_to(timestamp)
+
+                for pattern, event_func in self.ci.LOG_EVENT_PATTERNS:
+                    if pattern in line:
+                        event_func(line.rstrip("\n"))
+                        self._record(pattern, path, line_count)
+                        break
+        return line_count
+
+    def replay(self, paths: list[Path], settle: float = 120.0) -> int:
+        """Replays every log in paths, then lets settle more seconds pass so pending timeouts fire.
+        Returns the number of lines read."""
+        lines = 0
+        # The state machine prints as it goes, keep that out of the JSON output
+        with redirect_stdout(sys.stderr):
+            for path in find_logs(paths):
+                lines += self.replay_file(path)
+            if self.clock is not None:
+                self._advance_to(self.clock.now() + settle)
+        return lines
+
+    def close(self) -> None:
+        self.root.destroy()
+
+
+def add_arguments(parser) -> None:
+    parser.add_argument("paths", nargs="+", type=Path, help="yohoho logs or directories of them")
+    parser.add_argument("--settings", type=Path, default=None, help="Settings file to load the warning settings from")
+    parser.add_argument("--output", type=Path, default=None, help="Write state transitions here instead of stdout")
+    parser.add_argument("--speed", type=float, default=0.0, help="Replay at this many times real time, 0 (the default) is as fast as possible")
+    parser.add_argument("--settle", type=float, default=120.0, help="Seconds to run on after the last line so pending timeouts fire")
+
+
+def run(args) -> int:
+    """Regression test the Cursed Isles state machine against recorded logs, e.g.
+    uv run src/Thalassa.py ci-replay ~/yohoho_logs --speed 500 --output transitions.jsonl"""
+    configs = Configs()
+    configs.load_configs(args.settings)
+    # Never play sounds during a replay
+    configs.rumble_play_warning_sound = False
+    configs.play_swabbie_warning_sound = False
+
+    output = args.output.open("w", encoding="utf-8") if args.output else sys.stdout
+    started = time.perf_counter()
+    replayer = CIReplay(configs, output, args.speed)
+    try:
+        lines = replayer.replay(args.paths, args.settle)
+    finally:
+        replayer.close()
+        if args.output:
+            output.close()
+    print(F"{lines} lines, {replayer.transitions} transitions in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+    return 0
@@ -0,0 +1,36 @@
+import argparse
+
+from thalassa_core import benchmark, ci_replay, daemon, load_test, replay
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Headless commands, run as: uv run src/Thalassa.py <command> ..."""
+    parser = argparse.ArgumentParser(prog="Thalassa")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    replay_parser = subparsers.add_parser("replay", help="Run the chat filters over archived chatlogs and print matches as JSON lines")
+    replay.add_arguments(replay_parser)
+    replay_parser.set_defaults(run=replay.run)
+
+    ci_replay_parser = subparsers.add_parser("ci-replay", help="Replay yohoho logs through the Cursed Isles tracker and print its state changes as JSON lines")
+    ci_replay.add_arguments(ci_replay_parser)
+    ci_replay_parser.set_defaults(run=ci_replay.run)
+
+    bench_parser = subparsers.add_parser("bench", help="Benchmark the chat filters on synthetic chat and write the results as JSON")
+    benchmark.add_arguments(bench_parser)
+    bench_parser.set_defaults(run=benchmark.run)
+
+    load_parser = subparsers.add_parser("loadtest", help="Time lines from being written by another process to being matched")
+    load_test.add_arguments(load_parser)
+    load_parser.set_defaults(run=load_test.run)
+
+    daemon_parser = subparsers.add_parser("daemon", help="Tail the logs and forward filter matches to Discord and a JSON lines file, with no GUI or sound")
+    daemon.add_arguments(daemon_parser)
+    daemon_parser.set_defaults(run=daemon.run)
+
+    args = parser.parse_args(argv)
+    return args.run(args)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
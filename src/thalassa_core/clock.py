@@ -0,0 +1,40 @@
+import heapq
+import time
+
+
+class MonotonicClock():
+    """Wall clock time and Tk scheduling, what everything uses when running live."""
+    def now(self) -> float:
+        return time.monotonic()
+
+    def call_later(self, widget, ms: int, callback):
+        return widget.after(ms, callback)
+
+
+class ManualClock():
+    """A clock that only moves when told to, for replaying logs faster than real time.
+    Callbacks scheduled with call_later run, in order, as advance_to() passes their due time."""
+    def __init__(self, start: float = 0.0) -> None:
+        self._now = start
+        self._queue: list[tuple[float, int, object]] = []
+        self._sequence = 0 # Keeps callbacks due at the same time in the order they were scheduled
+
+    def now(self) -> float:
+        return self._now
+
+    def call_later(self, widget, ms: int, callback):
+        self._sequence += 1
+        heapq.heappush(self._queue, (self._now + ms / 1000, self._sequence, callback))
+        return self._sequence
+
+    def next_due(self) -> float | None:
+        """When the next scheduled callback is due, None if nothing is scheduled."""
+        return self._queue[0][0] if self._queue else None
+
+    def advance_to(self, timestamp: float) -> None:
+        """Move time forward, running every callback that falls due on the way."""
+        while self._queue and self._queue[0][0] <= timestamp:
+            due, _, callback = heapq.heappop(self._queue)
+            self._now = max(self._now, due)
+            callback()
+        self._now = max(self._now, timestamp)
@@ -54,12 +54,29 @@ class Configs:
         ),
     })
 
+    # Bumped on every edit to search_strings so compiled filters know to rebuild
+    filters_revision: int = 0
+
     log_dir: Path|None = None
     chatlog_dir: Path|None = None
 
     chat_filter_off: bool = False
     chat_mute: bool = False
 
+    # Log ingestion
+    threaded_ingest: bool = False # Tail and match logs on a background thread
+    ingest_queue_size: int = 2000
+    ingest_drain_budget_ms: float = 10.0
+    trade_memo_size: int = 4096 # Distinct trade messages whose filter results are remembered
+
+    # A speaker reposting the same matched message within this many seconds doesn't alert again, 0 to always alert
+    repost_cooldown_seconds: float = 300.0
+    repost_cooldown_max_entries: int = 5000
+
+    # Prometheus metrics at http://127.0.0.1:<port>/metrics
+    metrics_exporter_on: bool = False
+    metrics_exporter_port: int = 9464
+
     timer_offset: int = 0
     play_swabbie_warning_sound: bool = True
     swabbie_warning_sound = "plank_swabbie.mp3"
@@ -83,12 +100,17 @@ class Configs:
     specific_pirate = ""
 
     settings_file: Path = Path.cwd() / "src" / "media" / "settings.pkl"
+    checkpoint_file: Path|None = Path.cwd() / "src" / "media" / "log_offsets.json"
 
     @property
     def name(self) -> str:
         return self.chatlogs_path.stem.split("_")[0] if self.chatlogs_path.stem else ""
 
 
+    def bump_filters_revision(self) -> None:
+        self.filters_revision += 1
+
+
     def save_configs(self, path: Optional[Path] = None) -> None:
         path = Path(path) if path else self.settings_file
         path.parent.mkdir(parents=True, exist_ok=True)
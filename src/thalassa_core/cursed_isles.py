@@ -5,6 +5,7 @@ from functools import partial
 from thalassa_core.timer import Timer
 from thalassa_core.hom import Homunculus
 from thalassa_core.rumble import Rumble
+from thalassa_core.clock import MonotonicClock
 
 class PlayerData:
     def __init__(self, parent: tk.Widget, name: str):
@@ -14,9 +15,10 @@ class PlayerData:
         
 
 class CursedIsles(ttk.Frame):
-    def __init__(self, cursed_isles_frame: ttk.Frame, configs):
+    def __init__(self, cursed_isles_frame: ttk.Frame, configs, clock=None):
         super().__init__(cursed_isles_frame)
         self.configs = configs
+        self.clock = clock or MonotonicClock() # Shared with the timer and rumble so a replay can drive all three
         self.team: dict[str, PlayerData] = {}
 
         self.cursed_isles_frame = cursed_isles_frame
@@ -25,13 +27,13 @@ class CursedIsles(ttk.Frame):
         self.ci_in_progress = False
 
         self.timer_frame = ttk.Frame(cursed_isles_frame)
-        self.timer = Timer(self.timer_frame, configs)
+        self.timer = Timer(self.timer_frame, configs, self.clock)
 
         self.hom_frame = ttk.Frame(cursed_isles_frame)
         self.homunculus = Homunculus(self.hom_frame)
 
         self.rumble_frame = ttk.Frame(cursed_isles_frame)
-        self.rumble = Rumble(self.rumble_frame, self.configs)
+        self.rumble = Rumble(self.rumble_frame, self.configs, self.clock)
 
         self.LOG_EVENT_PATTERNS = [
             ("Reporting ready data.BoxingObject:", self._start_rumble),
@@ -42,6 +44,7 @@ class CursedIsles(ttk.Frame):
             ("Disabling skirmish environment mod [mod=dark_seas]", self._stop_ci),
             ("Stopping foraging in 119 seconds", self._start_forage),
         ]
+        self.EVENT_HANDLERS = dict(self.LOG_EVENT_PATTERNS)
 
 
 
@@ -196,7 +199,7 @@ class CursedIsles(ttk.Frame):
             self.configs.forage_warning_lead,
             False,
             self.configs.forage_warning_colour)
-        self.after(120000, self._stop_forage)
+        self.clock.call_later(self, 120000, self._stop_forage)
 
 
     def _stop_forage(self, data: str = None):
@@ -208,4 +211,11 @@ class CursedIsles(ttk.Frame):
         for pattern, event_func in self.LOG_EVENT_PATTERNS:
             if pattern in data:
                 event_func(data)
-                break   # stop checking patterns for this line of data
\ No newline at end of file
+                break   # stop checking patterns for this line of data
+
+    def process_events(self, events: list):
+        """Handles a tick's worth of GameEvents. The pattern each one matched is already known, so no searching."""
+        for event in events:
+            event_func = self.EVENT_HANDLERS.get(event.pattern)
+            if event_func:
+                event_func(event.line)
\ No newline at end of file
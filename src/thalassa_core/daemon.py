@@ -0,0 +1,143 @@
+from pathlib import Path
+import json
+import signal
+import sys
+import threading
+import time
+
+from thalassa_core.configs import Configs
+from thalassa_core.log_parser import LogParser
+from thalassa_core.events import EventBus, GameEvent, FilterMatchEvent
+from thalassa_core.forwarding import discord_message_for, match_record
+from thalassa_core.repost_cooldown import RepostCooldown
+
+DEFAULT_OUTPUT = Path.cwd() / "src" / "media" / "matches.jsonl"
+
+
+class JsonlSink():
+    """Appends every event to a file as a JSON line, flushed as it goes so the file can be tailed."""
+    def __init__(self, path: Path, configs: Configs) -> None:
+        self.configs = configs
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._fh = path.open("a", encoding="utf-8")
+
+    def write_matches(self, events: list) -> None:
+        for event in events:
+            self._write({"type": "filter_match", "time": time.time(), **match_record(self.configs, event)})
+        self._fh.flush()
+
+    def write_game_events(self, events: list) -> None:
+        for event in events:
+            self._write({"type": "game", "time": time.time(), "mode": event.mode, "pattern": event.pattern, "line": event.line})
+        self._fh.flush()
+
+    def _write(self, record: dict) -> None:
+        self._fh.write(json.dumps(record) + "\n")
+
+    def close(self) -> None:
+        self._fh.close()
+
+
+class ThalassaDaemon():
+    """LogParser and the Discord bot with no window and no sound, for a server or a second machine
+    that can see the chatlog directory. Filter matches go to Discord and a JSON lines file."""
+    def __init__(self, configs: Configs, output: Path | None = DEFAULT_OUTPUT, discord: bool = True,
+                 metrics_port: int | None = None, poll_interval: float = 0.05) -> None:
+        self.configs = configs
+        self.poll_interval = poll_interval
+        self._stop_event = threading.Event()
+
+        self.event_bus = EventBus()
+        self.log_parser = LogParser(self.event_bus.publish, configs)
+        if configs.log_dir:
+            self.log_parser.update_log_path(Path(configs.log_dir))
+        if configs.chatlog_dir:
+            self.log_parser.update_chatlog_path(Path(configs.chatlog_dir))
+
+        self.sink = None
+        if output is not None:
+            self.sink = JsonlSink(output, configs)
+            self.event_bus.subscribe(FilterMatchEvent, self.sink.write_matches, batch=True)
+            self.event_bus.subscribe(GameEvent, self.sink.write_game_events, batch=True)
+
+        self.ci_discord_bot = None
+        if discord:
+            # Imported here so running without Discord doesn't need discord.py installed
+            from thalassa_core.discord_bot import CIDiscordBot
+            self.ci_discord_bot = CIDiscordBot()
+            self.repost_cooldown = RepostCooldown(configs)
+            threading.Thread(target=self.ci_discord_bot.run_bot_threaded, name="DiscordBot", daemon=True).start()
+            self.event_bus.subscribe(FilterMatchEvent, self.forward_to_discord, batch=True)
+
+        self.metrics_exporter = None
+        if metrics_port is not None:
+            from thalassa_core.metrics_exporter import MetricsExporter
+            self.metrics_exporter = MetricsExporter(metrics_port)
+            self.metrics_exporter.start()
+
+    def forward_to_discord(self, events: list) -> None:
+        for event in events:
+            if not self.repost_cooldown.should_alert(event.key, event.line, event.record):
+                continue
+            message = discord_message_for(self.configs, event.key, event.line)
+            if message is not None:
+                self.ci_discord_bot.send_trade_from_external(message)
+
+    def run(self) -> None:
+        """Tails the logs until stop() is called."""
+        watcher = self.log_parser.watcher
+        while not self._stop_event.is_set():
+            try:
+                self.log_parser.update_all_logs()
+                self.event_bus.flush()
+            except Exception as error:
+                print(F"Failed to update logs: {error}")
+            watcher.wait(self.poll_interval)
+
+    def stop(self, *args) -> None:
+        self._stop_event.set()
+
+    def close(self) -> None:
+        self.log_parser.close()
+        self.event_bus.flush()
+        if self.sink:
+            self.sink.close()
+        if self.metrics_exporter:
+            self.metrics_exporter.stop()
+
+
+def add_arguments(parser) -> None:
+    parser.add_argument("--settings", type=Path, default=None, help="Settings file to load the filters and paths from")
+    parser.add_argument("--logs", type=Path, default=None, help="yohoho log directory, instead of the one in the settings")
+    parser.add_argument("--chatlogs", type=Path, default=None, help="Chatlog directory, instead of the one in the settings")
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT, help="JSON lines file to append matches to")
+    parser.add_argument("--no-output", action="store_true", help="Don't write matches to a file")
+    parser.add_argument("--no-discord", action="store_true", help="Don't start the Discord bot")
+    parser.add_argument("--metrics-port", type=int, default=None, help="Serve Prometheus metrics on localhost at this port")
+
+
+def run(args) -> int:
+    """Forward trade matches with no GUI, e.g.
+    uv run src/Thalassa.py daemon --chatlogs ~/Documents/YPP_Chatlogs"""
+    configs = Configs()
+    configs.load_configs(args.settings)
+    if args.logs:
+        configs.log_dir = args.logs
+    if args.chatlogs:
+        configs.chatlog_dir = args.chatlogs
+    if not configs.log_dir and not configs.chatlog_dir:
+        print("No log or chatlog directory, set one in the GUI or pass --logs/--chatlogs", file=sys.stderr)
+        return 2
+    metrics_port = args.metrics_port
+    if metrics_port is None and configs.metrics_exporter_on:
+        metrics_port = configs.metrics_exporter_port
+
+    daemon = ThalassaDaemon(configs, None if args.no_output else args.output, not args.no_discord, metrics_port)
+    signal.signal(signal.SIGINT, daemon.stop)
+    signal.signal(signal.SIGTERM, daemon.stop)
+    print("Thalassa daemon running, Ctrl+C to stop")
+    try:
+        daemon.run()
+    finally:
+        daemon.close()
+    return 0
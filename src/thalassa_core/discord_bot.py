@@ -8,6 +8,9 @@ from datetime import datetime, timedelta, timezone
 import re
 import platform
 import subprocess
+import time
+
+from thalassa_core.metrics import metrics
 
 load_dotenv()
 
@@ -120,16 +123,22 @@ class CIDiscordBot:
         await self.check_old_messages()
         logging.info(f"Sweep complete. Bot is ready for commands.")
 
-    async def new_trade_message(self, message: str):
-        """The actual async function that sends the message."""
+    async def new_trade_message(self, message: str, queued_ns: int | None = None):
+        """The actual async function that sends the message.
+        queued_ns is the perf_counter_ns when the send was asked for, so the wait for the loop is timed too."""
+        start = queued_ns or time.perf_counter_ns()
         channel = self.bot.get_channel(self.MAP_TRADING_CHANNEL_ID)
         if channel is None:
             logging.warning("Trade channel not found!")
+            metrics.counter("discord_failures", reason="no_channel").inc()
             return
         try:
             await channel.send(content=message)
+            metrics.histogram("discord_send").record_since(start)
+            metrics.counter("discord_sends").inc()
             logging.info(f"Sent trade message: {message}")
         except Exception as e:
+            metrics.counter("discord_failures", reason="error").inc()
             logging.error(f"Failed to send trade message: {e}")
 
     def run_sweep(self):
@@ -144,8 +153,9 @@ class CIDiscordBot:
         It schedules the async task on the bot's event loop.
         """
         if self.bot.is_ready() and self.loop:
-            asyncio.run_coroutine_threadsafe(self.new_trade_message(message), self.loop)
+            asyncio.run_coroutine_threadsafe(self.new_trade_message(message, time.perf_counter_ns()), self.loop)
         else:
+            metrics.counter("discord_failures", reason="not_ready").inc()
             logging.warning("Bot is not ready yet; cannot send message.")
 
     def set_discord_token(self, token: str) -> None:
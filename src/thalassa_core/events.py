@@ -0,0 +1,103 @@
+from collections import deque
+import time
+
+from thalassa_core.metrics import metrics
+
+
+class GameEvent():
+    """A line that matched one of the LOG_EVENT_PATTERNS, along with the pattern it matched
+    so whoever handles it never has to search the line again."""
+    __slots__ = ("line", "pattern", "mode")
+
+    def __init__(self, line: str, pattern: str, mode: str) -> None:
+        self.line = line
+        self.pattern = pattern
+        self.mode = mode  # Which part of the app the pattern is for, e.g. "Cursed Isles"
+
+    def __repr__(self) -> str:
+        return F"GameEvent({self.pattern!r}, {self.line!r})"
+
+
+class FilterMatchEvent():
+    """A chatlog line that one of the chat filters matched. However many of the filter's terms
+    hit, and however many buy/sell parts of the line they hit in, a line gets one event per filter."""
+    __slots__ = ("line", "key", "matches", "spans", "record")
+
+    def __init__(self, line: str, key, matches: list[str] | None = None, spans: list[tuple[int, int]] | None = None, record=None) -> None:
+        self.line = line
+        self.key = key  # Key of the filter in configs.search_strings
+        self.matches = matches or []  # Every term that matched in the order the filter lists them, the matched text for regex filters
+        self.spans = spans or []  # (start, end) of each hit within line, where they are known
+        self.record = record  # The ChatLine the line was parsed into
+
+    @property
+    def match(self) -> str | None:
+        """The first term that matched."""
+        return self.matches[0] if self.matches else None
+
+    @property
+    def span(self) -> tuple[int, int] | None:
+        return self.spans[0] if self.spans else None
+
+    def __repr__(self) -> str:
+        return F"FilterMatchEvent({self.key!r}, {self.matches!r}, {self.line!r})"
+
+
+class EventBus():
+    """Collects events as they are published and hands them out in one go when flushed,
+    usually once per GUI tick.
+
+    Subscriptions are by event type. A batch subscriber gets a single call with the list of every
+    event of its type from the tick, anyone else gets a call per event. Publishing is safe from
+    another thread, flushing should always happen on the same one."""
+    def __init__(self) -> None:
+        self._subscribers: dict[type, list[tuple[object, bool]]] = {}
+        self._pending: deque = deque()
+        self._deliver_time = metrics.histogram("deliver")
+
+    def subscribe(self, event_type: type, callback, batch: bool = False) -> None:
+        self._subscribers.setdefault(event_type, []).append((callback, batch))
+
+    def unsubscribe(self, event_type: type, callback) -> None:
+        subscribers = self._subscribers.get(event_type, [])
+        subscribers[:] = [(subscriber, batch) for subscriber, batch in subscribers if subscriber != callback]
+
+    def publish(self, event) -> None:
+        self._pending.append(event)
+
+    __call__ = publish  # So a bus can be handed to LogParser as its event callback
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    def flush(self) -> int:
+        """Delivers everything published since the last flush. Returns the number of events."""
+        if not self._pending:
+            return 0
+        start = time.perf_counter_ns()
+
+        # Only take what is there now, anything published while delivering waits for the next flush
+        by_type: dict[type, list] = {}
+        for _ in range(len(self._pending)):
+            event = self._pending.popleft()
+            by_type.setdefault(type(event), []).append(event)
+
+        delivered = 0
+        for event_type, events in by_type.items():
+            delivered += len(events)
+            for callback, batch in self._subscribers.get(event_type, ()):
+                if batch:
+                    self._call(callback, events)
+                else:
+                    for event in events:
+                        self._call(callback, event)
+        self._deliver_time.record_since(start)
+        return delivered
+
+    def _call(self, callback, argument) -> None:
+        # One subscriber failing shouldn't stop the rest from getting their events
+        try:
+            callback(argument)
+        except Exception as error:
+            print(F"Failed to deliver events to {callback}: {error}")
@@ -0,0 +1,94 @@
+import time
+
+HOT = "hot"
+WARM = "warm"
+COLD = "cold"
+
+
+class ActivityTracker():
+    """Sorts the files in a directory by how recently they were written to, so the tailer only
+    spends time on the ones in use.
+
+    Hot files (written in the last hot_seconds) are read every tick, warm files (written in the
+    last warm_seconds) every warm_interval seconds, and cold files are not read at all. Cold files
+    only get a stat every cold_interval seconds in case something starts writing to them again,
+    the caller also warms them up whenever their directory changes."""
+    def __init__(self, hot_seconds: float = 60.0, warm_seconds: float = 3600.0,
+                 warm_interval: float = 2.0, cold_interval: float = 30.0) -> None:
+        self.hot_seconds = hot_seconds
+        self.warm_seconds = warm_seconds
+        self.warm_interval = warm_interval
+        self.cold_interval = cold_interval
+
+        self.last_active: dict[str, float] = {}  # monotonic time of the last write we saw
+        # Kept as separate sets so a tick only ever looks at the hot ones
+        self.files: dict[str, set[str]] = {HOT: set(), WARM: set(), COLD: set()}
+        self.state: dict[str, str] = {}
+        self._next_warm = 0.0
+        self._next_cold = 0.0
+
+    def _set_state(self, filename: str, state: str) -> None:
+        old_state = self.state.get(filename)
+        if old_state == state:
+            return
+        if old_state is not None:
+            self.files[old_state].discard(filename)
+        self.files[state].add(filename)
+        self.state[filename] = state
+
+    def add(self, filename: str, idle_seconds: float) -> None:
+        """Start tracking a file that was last written idle_seconds ago."""
+        self.last_active[filename] = time.monotonic() - max(idle_seconds, 0.0)
+        self._set_state(filename, self._classify(idle_seconds))
+
+    def remove(self, filename: str) -> None:
+        self.last_active.pop(filename, None)
+        state = self.state.pop(filename, None)
+        if state is not None:
+            self.files[state].discard(filename)
+
+    def clear(self) -> None:
+        self.last_active.clear()
+        self.state.clear()
+        for files in self.files.values():
+            files.clear()
+
+    def touch(self, filename: str) -> None:
+        """The file has just been written to."""
+        if filename in self.state:
+            self.last_active[filename] = time.monotonic()
+            self._set_state(filename, HOT)
+
+    def _classify(self, idle_seconds: float) -> str:
+        if idle_seconds <= self.hot_seconds:
+            return HOT
+        if idle_seconds <= self.warm_seconds:
+            return WARM
+        return COLD
+
+    def due(self) -> tuple[list[str], list[str], list[str]]:
+        """Returns (files to read now, cold files to stat, files that have just gone cold).
+        Files are demoted as they go quiet, files that have just gone cold should have their handles closed."""
+        now = time.monotonic()
+        candidates = list(self.files[HOT])
+        if now >= self._next_warm:
+            self._next_warm = now + self.warm_interval
+            candidates.extend(self.files[WARM])
+        to_stat = []
+        if now >= self._next_cold:
+            self._next_cold = now + self.cold_interval
+            to_stat = list(self.files[COLD])
+
+        to_read = []
+        cooled = []
+        for filename in candidates:
+            new_state = self._classify(now - self.last_active[filename])
+            self._set_state(filename, new_state)
+            if new_state == COLD:
+                cooled.append(filename)
+            else:
+                to_read.append(filename)
+        return to_read, to_stat, cooled
+
+    def counts(self) -> dict[str, int]:
+        return {state: len(files) for state, files in self.files.items()}
@@ -0,0 +1,53 @@
+from pathlib import Path
+import os
+import time
+
+# A directory modified this recently might be modified again within the same mtime tick,
+# which would go unnoticed, so it keeps being rescanned until it has settled.
+RACY_WINDOW_NS = 2_000_000_000
+
+
+class FileRegistry():
+    """Lists the files in one directory, but only does the work when the directory has changed.
+
+    Creating, deleting or renaming a file updates the directory's own mtime, so while that stays
+    the same the listing can't have changed and a scan costs one stat. When it does change,
+    one os.scandir pass lists everything and the DirEntry stat results are reused."""
+    def __init__(self, path: Path, accept) -> None:
+        self.path = Path(path)
+        self.accept = accept  # Called with a filename, returns True for files we care about
+        self._mtime_ns: int | None = None
+        self._racy = False
+
+    def invalidate(self) -> None:
+        """Make the next scan list the directory whatever its mtime is."""
+        self._mtime_ns = None
+
+    def scan(self) -> dict[str, os.stat_result] | None:
+        """Returns {filename: stat} for every accepted file, or None if nothing can have changed since the last scan.
+        A missing directory is reported once as an empty listing."""
+        try:
+            mtime_ns = os.stat(self.path).st_mtime_ns
+        except OSError:
+            if self._mtime_ns == -1:
+                return None
+            print(F"Directory not found: {self.path}")
+            self._mtime_ns = -1
+            return {}
+
+        if mtime_ns == self._mtime_ns and not self._racy:
+            return None
+        self._mtime_ns = mtime_ns
+        self._racy = time.time_ns() - mtime_ns < RACY_WINDOW_NS
+
+        entries = {}
+        try:
+            with os.scandir(self.path) as directory:
+                for entry in directory:
+                    if self.accept(entry.name) and entry.is_file():
+                        entries[entry.name] = entry.stat()
+        except OSError as error:
+            print(F"Failed to scan {self.path}: {error}")
+            self._mtime_ns = None
+            return None
+        return entries
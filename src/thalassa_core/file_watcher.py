@@ -0,0 +1,183 @@
+from pathlib import Path
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+
+# inotify event masks (see <sys/inotify.h>)
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+
+WATCH_MASK = (IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO |
+              IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF)
+
+EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, len
+
+
+class PollingWatcher():
+    """Fallback watcher. Has no way of knowing what changed, so every watched directory
+    is reported as needing a full rescan on each poll."""
+    reports_names = False
+
+    def __init__(self) -> None:
+        self.directories: set[Path] = set()
+
+    def watch(self, path: Path) -> None:
+        self.directories.add(Path(path))
+
+    def unwatch(self, path: Path) -> None:
+        self.directories.discard(Path(path))
+
+    def fileno(self) -> int | None:
+        return None
+
+    def wait(self, timeout: float) -> bool:
+        """Sleep for the poll interval, there is nothing to wait on."""
+        time.sleep(timeout)
+        return True
+
+    def read_changes(self) -> dict[Path, set[str] | None]:
+        """Returns {directory: None} for every watched directory, None meaning rescan everything."""
+        return {directory: None for directory in self.directories}
+
+    def close(self) -> None:
+        self.directories.clear()
+
+
+class InotifyWatcher():
+    """Linux inotify watcher. The kernel tells us which files in a watched directory
+    were written, created, moved or deleted, so nothing needs to be polled.
+
+    A directory that can't be watched, because it doesn't exist yet or was deleted or moved,
+    is polled instead: every read_changes() reports it for a rescan and tries to watch it again."""
+    reports_names = True
+
+    def __init__(self) -> None:
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, F"inotify_init1 failed: {os.strerror(errno)}")
+
+        self._watches: dict[int, Path] = {}  # Watch descriptor -> directory
+        self._pending: dict[Path, set[str] | None] = {}
+        self._unwatched: set[Path] = set()  # Asked to watch but have no watch, polled until one can be added
+
+    def watch(self, path: Path) -> None:
+        path = Path(path)
+        if path in self._watches.values():
+            return
+        # Anything could have happened before the watch existed
+        self._pending[path] = None
+        if not self._add_watch(path):
+            errno = ctypes.get_errno()
+            print(F"Failed to watch {path}, polling it until it can be: {os.strerror(errno)}")
+            self._unwatched.add(path)
+
+    def _add_watch(self, path: Path) -> bool:
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(path), WATCH_MASK)
+        if wd < 0:
+            return False
+        self._watches[wd] = path
+        return True
+
+    def unwatch(self, path: Path) -> None:
+        path = Path(path)
+        for wd, watched_path in list(self._watches.items()):
+            if watched_path == path:
+                self._libc.inotify_rm_watch(self._fd, wd)
+                del self._watches[wd]
+        self._pending.pop(path, None)
+        self._unwatched.discard(path)
+
+    def fileno(self) -> int | None:
+        return self._fd
+
+    def wait(self, timeout: float) -> bool:
+        """Block until the kernel has events for us or the timeout passes."""
+        if self._pending:
+            return True
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        return bool(readable)
+
+    def _read_events(self) -> None:
+        while True:
+            try:
+                buffer = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                return
+            if not buffer:
+                return
+
+            offset = 0
+            while offset < len(buffer):
+                wd, mask, _cookie, length = EVENT_HEADER.unpack_from(buffer, offset)
+                offset += EVENT_HEADER.size
+                name = buffer[offset:offset + length].rstrip(b"\0")
+                offset += length
+
+                if mask & IN_Q_OVERFLOW:
+                    # The kernel dropped events, all we can do is rescan everything
+                    for path in self._watches.values():
+                        self._pending[path] = None
+                    continue
+
+                path = self._watches.get(wd)
+                if path is None:
+                    continue
+
+                if mask & (IN_DELETE_SELF | IN_MOVE_SELF | IN_IGNORED):
+                    self._pending[path] = None
+                    if mask & IN_MOVE_SELF:
+                        # The watch follows the directory to its new name, which isn't the path we were asked for
+                        self._libc.inotify_rm_watch(self._fd, wd)
+                    if mask & (IN_MOVE_SELF | IN_IGNORED):
+                        del self._watches[wd]
+                        self._unwatched.add(path)
+                    continue
+
+                names = self._pending.setdefault(path, set())
+                if names is not None and name:
+                    names.add(os.fsdecode(name))
+
+    def read_changes(self) -> dict[Path, set[str] | None]:
+        """Returns {directory: changed filenames} for directories that had events since the
+        last call. A value of None means the directory needs a full rescan."""
+        self._read_events()
+        for path in list(self._unwatched):
+            # Polled until it can be watched again, rescanned once more when it is in case of anything in between
+            if self._add_watch(path):
+                print(F"Watching {path} again")
+                self._unwatched.discard(path)
+            self._pending[path] = None
+        changes = self._pending
+        self._pending = {}
+        return changes
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+        self._watches.clear()
+        self._unwatched.clear()
+
+
+def create_watcher(use_inotify: bool = True) -> InotifyWatcher | PollingWatcher:
+    """Use inotify where the platform has it, otherwise fall back to polling."""
+    if use_inotify and sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher()
+        except (OSError, AttributeError) as error:
+            print(F"inotify unavailable, falling back to polling: {error}")
+    return PollingWatcher()
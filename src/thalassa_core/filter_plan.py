@@ -0,0 +1,75 @@
+import re
+
+from thalassa_core.multi_matcher import MultiPatternMatcher
+
+
+class CompiledFilter():
+    """A SearchEntry with everything the hot path needs worked out ahead of time."""
+    __slots__ = ("key", "entry", "channel", "string_or_regex", "regex", "terms", "side")
+
+    def __init__(self, key, entry) -> None:
+        self.key = key
+        self.entry = entry
+        self.channel: str = entry.channel
+        self.string_or_regex: str = entry.string_or_regex
+        self.regex: re.Pattern | None = None
+        self.terms: tuple[str, ...] = ()
+        # Trade filters: "buy" searches the sell parts of a message, "sell" searches the buy parts
+        self.side: str | None = entry.buy_or_sell.lower() if entry.channel == "trade" else None
+
+        if self.string_or_regex == "Regex" and entry.regex:
+            try:
+                self.regex = re.compile(entry.regex)
+            except re.error as error:
+                print(F"Invalid regex in filter '{entry.name}': {error}")
+        elif self.string_or_regex == "Strings":
+            # Split by pipe and strip whitespace
+            self.terms = tuple(dict.fromkeys(term.strip() for term in entry.strings.split('|') if term.strip()))
+
+
+class FilterPlan():
+    """The compiled form of configs.search_strings. Built once per filters revision, so nothing
+    about the filter definitions is parsed while lines are being matched."""
+    def __init__(self, search_strings: dict, revision: int) -> None:
+        self.revision = revision
+        # Disabled filters never make it into the plan
+        self.filters: list[CompiledFilter] = [
+            CompiledFilter(key, entry) for key, entry in list(search_strings.items()) if entry.on_off
+        ]
+
+        # Filters grouped by the channel they apply to, "" holds the channel-less ones
+        self.channels: dict[str, list[CompiledFilter]] = {}
+        for compiled in self.filters:
+            self.channels.setdefault(compiled.channel, []).append(compiled)
+
+        # Index from a line's channel to the only filters that line needs to visit. Each bucket
+        # has that channel's filters plus the channel-less ones, in the original filter order,
+        # and its own term automaton so a crew line never scans trade terms.
+        wildcard = [compiled for compiled in self.filters if not compiled.channel]
+        self.wildcard = FilterBucket(wildcard)
+        self.by_channel: dict[str, FilterBucket] = {
+            channel: FilterBucket([compiled for compiled in self.filters if compiled.channel in ("", channel)])
+            for channel in self.channels if channel
+        }
+
+    def bucket_for(self, channel: str | None) -> "FilterBucket":
+        """The filters that apply to a line from the given channel."""
+        if channel is None:
+            return self.wildcard
+        return self.by_channel.get(channel, self.wildcard)
+
+
+class FilterBucket():
+    """The filters one channel's lines are checked against."""
+    __slots__ = ("filters", "by_key", "order", "regex_filters", "term_matcher")
+
+    def __init__(self, filters: list[CompiledFilter]) -> None:
+        self.filters = filters
+        # String filters are only looked up by the keys the term matcher finds, so a line never
+        # visits a filter none of its terms are in. Regex filters have to be tried on every line.
+        self.by_key: dict = {compiled.key: compiled for compiled in filters}
+        self.order: dict = {compiled.key: position for position, compiled in enumerate(filters)}
+        self.regex_filters = [compiled for compiled in filters if compiled.regex is not None]
+        self.term_matcher = MultiPatternMatcher(
+            (term, compiled.key) for compiled in filters for term in compiled.terms
+        )
@@ -0,0 +1,31 @@
+from thalassa_core.events import FilterMatchEvent
+
+# Matches of this filter are posted to the map trading channel on Discord
+DISCORD_FILTER_NAME = "Buying CI Map"
+
+
+def discord_message_for(configs, key, text: str) -> str | None:
+    """What to post to Discord for a filter match, None if matches of this filter aren't posted.
+    The chatlog timestamp is cut off the front."""
+    entry = configs.search_strings.get(key)
+    if entry is None or entry.name != DISCORD_FILTER_NAME:
+        return None
+    if "] " in text:
+        return text.split("] ", 1)[1]
+    return text
+
+
+def match_record(configs, event: FilterMatchEvent) -> dict:
+    """A filter match as a dict ready to be written out as JSON."""
+    entry = configs.search_strings.get(event.key)
+    record = event.record
+    return {
+        "filter": event.key,
+        "name": entry.name if entry else None,
+        "matches": event.matches,
+        "spans": event.spans,
+        "timestamp": record.timestamp if record else None,
+        "speaker": record.speaker if record else None,
+        "channel": record.channel if record else None,
+        "line": event.line,
+    }
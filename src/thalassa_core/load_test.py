@@ -0,0 +1,171 @@
+from multiprocessing import Process, Value
+from pathlib import Path
+import json
+import re
+import tempfile
+import time
+
+from thalassa_core.configs import Configs
+from thalassa_core.log_parser import LogParser
+from thalassa_core.log_tailer import LogTailer
+from thalassa_core.events import EventBus, GameEvent, FilterMatchEvent
+
+CHATLOG_NAME = "Loadtest_emerald_chat_log.txt"
+LOG_NAME = "yohoho_1764097495517.log"
+PROBE_PATTERN = re.compile(r"seq=(\d+) t=(\d+)")
+
+
+def write_lines(chatlog: str, log: str, rate: float, duration: float, log_ratio: float, written) -> None:
+    """Runs in the writer process. Appends rate lines a second for duration seconds, each tagged with
+    its sequence number and the monotonic time it was written, and flushed straight away like the game does.
+    Every log_ratio-th share of lines goes to the yohoho log, the rest are trade chat that the default
+    "Buying CI Map" filter matches. written ends up holding the number of lines written."""
+    log_every = round(1 / log_ratio) if log_ratio > 0 else 0
+    total = int(rate * duration)
+    with open(chatlog, "a", encoding="utf-8") as chat_fh, open(log, "a", encoding="utf-8") as log_fh:
+        started = time.monotonic()
+        for seq in range(total):
+            # Sleep off any time we are ahead, never try to catch up by bunching lines
+            delay = started + seq / rate - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            stamp = time.monotonic_ns()
+            if log_every and seq % log_every == 0:
+                log_fh.write(F"2025/11/25 19:20:11:789 INFO ak.doLog: Stopping foraging in 119 seconds seq={seq} t={stamp}\n")
+                log_fh.flush()
+            else:
+                chat_fh.write(F'[19:20:11] Loadtester trade chats, "selling ci map seq={seq} t={stamp}"\n')
+                chat_fh.flush()
+            written.value = seq + 1
+
+
+def percentile(sorted_values: list, fraction: float):
+    if not sorted_values:
+        return None
+    return sorted_values[min(int(fraction * len(sorted_values)), len(sorted_values) - 1)]
+
+
+class LatencyRecorder():
+    """Subscribed to every event. Times each tagged line from when it was written to when it was delivered."""
+    def __init__(self) -> None:
+        self.latencies: dict[str, list[int]] = {}  # event type -> nanoseconds
+        self.seen: dict[int, int] = {}  # seq -> times emitted
+
+    def __call__(self, event) -> None:
+        now = time.monotonic_ns()
+        probe = PROBE_PATTERN.search(event.line)
+        if probe is None:
+            return
+        seq, stamp = int(probe.group(1)), int(probe.group(2))
+        self.seen[seq] = self.seen.get(seq, 0) + 1
+        if self.seen[seq] == 1:
+            self.latencies.setdefault(type(event).__name__, []).append(now - stamp)
+
+    def report(self, written: int) -> dict:
+        summary = {
+            "written": written,
+            "received": len(self.seen),
+            "dropped": sum(1 for seq in range(written) if seq not in self.seen),
+            "duplicated": sum(1 for count in self.seen.values() if count > 1),
+        }
+        for event_type, latencies in self.latencies.items():
+            latencies = sorted(latencies)
+            summary[event_type] = {
+                "count": len(latencies),
+                "p50_ms": round(percentile(latencies, 0.50) / 1e6, 3),
+                "p99_ms": round(percentile(latencies, 0.99) / 1e6, 3),
+                "max_ms": round(latencies[-1] / 1e6, 3),
+            }
+        return summary
+
+
+def load_test(directory: Path, rate: float, duration: float, log_ratio: float = 0.1,
+              threaded: bool = False, poll_interval: float = 0.05, grace: float = 2.0) -> dict:
+    """Runs a writer process against directory while a LogParser tails it, the way the GUI would.
+    With threaded the parser runs in a LogTailer and events are timed when drained, as with threaded ingest."""
+    chat_dir = directory / "chatlogs"
+    log_dir = directory / "logs"
+    chat_dir.mkdir(parents=True, exist_ok=True)
+    log_dir.mkdir(parents=True, exist_ok=True)
+    chatlog = chat_dir / CHATLOG_NAME
+    log = log_dir / LOG_NAME
+    chatlog.touch()
+    log.touch()
+
+    recorder = LatencyRecorder()
+    bus = EventBus()
+    bus.subscribe(GameEvent, recorder)
+    bus.subscribe(FilterMatchEvent, recorder)
+    configs = Configs(checkpoint_file=None)
+    configs.chat_filter_off = False
+    parser = LogParser(bus.publish, configs)
+    parser.update_chatlog_path(chat_dir)
+    parser.update_log_path(log_dir)
+    parser.update_all_logs() # The first scan finds the empty files, so everything written from here is read
+
+    tailer = None
+    if threaded:
+        tailer = LogTailer(parser, configs.ingest_queue_size, poll_interval)
+        tailer.start()
+
+    def tick(timeout: float) -> None:
+        if tailer:
+            time.sleep(timeout)
+            tailer.drain(bus.publish, configs.ingest_drain_budget_ms / 1000)
+        else:
+            parser.watcher.wait(timeout)
+            parser.update_all_logs()
+        bus.flush()
+
+    written = Value("q", 0)
+    writer = Process(target=write_lines, args=(str(chatlog), str(log), rate, duration, log_ratio, written), daemon=True)
+    started = time.perf_counter()
+    writer.start()
+    try:
+        while writer.is_alive():
+            tick(poll_interval)
+        # Let the parser catch up with the last lines
+        deadline = time.perf_counter() + grace
+        while len(recorder.seen) < written.value and time.perf_counter() < deadline:
+            tick(poll_interval)
+    finally:
+        writer.join()
+        if tailer:
+            tailer.stop()
+            tailer.join()
+        parser.close()
+
+    report = recorder.report(written.value)
+    report["seconds"] = round(time.perf_counter() - started, 3)
+    report["rate"] = rate
+    report["watcher"] = type(parser.watcher).__name__
+    report["threaded"] = threaded
+    if tailer:
+        report["queue"] = tailer.stats()
+    return report
+
+
+def add_arguments(parser) -> None:
+    parser.add_argument("--rate", type=float, default=1000.0, help="Lines written per second")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds to keep writing for")
+    parser.add_argument("--log-ratio", type=float, default=0.1, help="Share of lines written to the yohoho log rather than the chatlog")
+    parser.add_argument("--threaded", action="store_true", help="Run the parser in a LogTailer thread like threaded ingest does")
+    parser.add_argument("--poll-interval", type=float, default=0.05, help="Seconds between updates, the GUI uses 0.05")
+    parser.add_argument("--dir", type=Path, default=None, help="Directory to write the logs in, a temporary one by default")
+    parser.add_argument("--output", type=Path, default=None, help="Also write the report here as JSON")
+
+
+def run(args) -> int:
+    """Measure how long a line takes to go from being written to being emitted, e.g.
+    uv run src/Thalassa.py loadtest --rate 5000 --duration 30"""
+    if args.dir:
+        report = load_test(args.dir, args.rate, args.duration, args.log_ratio, args.threaded, args.poll_interval)
+    else:
+        with tempfile.TemporaryDirectory(prefix="thalassa_load_") as directory:
+            report = load_test(Path(directory), args.rate, args.duration, args.log_ratio, args.threaded, args.poll_interval)
+
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with args.output.open("w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2)
+    return 1 if report["dropped"] or report["duplicated"] else 0
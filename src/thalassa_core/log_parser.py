@@ -1,9 +1,31 @@
 from pathlib import Path
 import re
+import stat
+import time
+
+from thalassa_core.file_watcher import create_watcher
+from thalassa_core.file_registry import FileRegistry
+from thalassa_core.file_activity import ActivityTracker, HOT
+from thalassa_core.checkpoints import OffsetCheckpoints, file_key
+from thalassa_core.log_reader import IncrementalReader
+from thalassa_core.multi_matcher import MultiPatternMatcher
+from thalassa_core.filter_plan import FilterPlan
+from thalassa_core.chat_line import ChatLine, parse_chat_line
+from thalassa_core.trade_tokenizer import TradeTokenizer
+from thalassa_core.lru_memo import LRUMemo
+from thalassa_core.metrics import Counter, metrics
+from thalassa_core.events import GameEvent, FilterMatchEvent
 
 class LogData():
-    pirate: str = ""
-    size: int = 0
+    __slots__ = ("pirate", "size", "key", "reader", "lines_read")
+
+    def __init__(self, key: str = "", size: int = 0, reader: IncrementalReader | None = None,
+                 lines_read: Counter | None = None) -> None:
+        self.pirate: str = ""
+        self.size = size
+        self.key = key # Device and inode, see checkpoints.file_key
+        self.reader = reader
+        self.lines_read = lines_read
 
 class LogParser():
     def __init__(self, event_callback, configs) -> None:
@@ -18,6 +40,8 @@ class LogParser():
         self.new_log_path: Path | None = None
         self.new_chatlog_path: Path | None = None
 
+        self.LOG_NAME_PATTERN = re.compile(r"yohoho_.*\.log")
+
         self.SELL_STRINGS = ["sell", "[s]", "wts", "free", "giving"]
         self.BUY_STRINGS = ["buy", "[b]", "wtb", "lf", "looking"]
 
@@ -33,11 +57,63 @@ class LogParser():
 
         self.CHATLOG_EVENT_PATTERNS = []
 
-
-    def _emit(self, mode, data: str = None, *args, **kwargs):
-        """Notify the GUI of an event."""
+        # Every event pattern is found in one pass over the line
+        self.event_matcher = MultiPatternMatcher((pattern, (pattern, mode)) for pattern, mode in self.LOG_EVENT_PATTERNS)
+
+        # Compiled buy/sell keyword splitter, rebuilt if BUY_STRINGS or SELL_STRINGS change
+        self._trade_tokenizer: TradeTokenizer | None = None
+
+        # Compiled filters, rebuilt whenever configs.filters_revision changes
+        self._filter_plan: FilterPlan | None = None
+
+        # Wakes the parser only when something in the log directories changes
+        self.watcher = create_watcher()
+        # Remembers how far each file has been read across restarts
+        self.checkpoints = OffsetCheckpoints(configs.checkpoint_file)
+        # Files found by the first scan of a directory resume from their checkpoint, or start at their
+        # current size if they have never been read. Anything created after that gets read from the start.
+        self._log_dir_scanned = False
+        self._chatlog_dir_scanned = False
+        # Checkpoints of files not found by the first listing of each directory are dropped, see _prune_checkpoints
+        self._listed_dirs: set[Path] = set()
+        self._checkpoints_pruned = False
+        # Directory listings, only redone when a directory's mtime changes
+        self._log_registry: FileRegistry | None = None
+        self._chatlog_registry: FileRegistry | None = None
+        # Hot/warm/cold sorting, so polling only reads the files in use
+        self._log_activity = ActivityTracker()
+        self._chatlog_activity = ActivityTracker()
+        self._newest_log_epoch = 0
+        # Trade filter results by message body, so a repost skips the tokenizer and term matching
+        self.trade_memo = LRUMemo("trade_filters", configs.trade_memo_size)
+
+        # Per-stage timings, see metrics.py
+        self._scan_time = metrics.histogram("scan")
+        self._chat_match_time = metrics.histogram("match", source="chatlog")
+        self._log_match_time = metrics.histogram("match", source="log")
+        self._emit_time = metrics.histogram("emit")
+        # Counters looked up once per event type and per filter, not on every emit
+        self._event_counts: dict[type, Counter] = {}
+        self._filter_match_counts: dict[object, Counter] = {}
+
+
+    def _emit(self, event: GameEvent | FilterMatchEvent):
+        """Hand an event to the event callback, usually an EventBus."""
+        event_type = type(event)
+        counter = self._event_counts.get(event_type)
+        if counter is None:
+            counter = self._event_counts[event_type] = metrics.counter("events", type=event_type.__name__)
+        counter.inc()
+        if event_type is FilterMatchEvent:
+            # By key rather than name, so renaming a filter doesn't start a new series
+            counter = self._filter_match_counts.get(event.key)
+            if counter is None:
+                counter = self._filter_match_counts[event.key] = metrics.counter("filter_matches", filter=event.key)
+            counter.inc()
         if self.event_callback:
-            self.event_callback(mode, data, *args, **kwargs)
+            start = time.perf_counter_ns()
+            self.event_callback(event)
+            self._emit_time.record_since(start)
     
 
     def update_log_path(self, new_path: Path) -> None:
@@ -50,230 +126,441 @@ class LogParser():
         self.new_chatlog_path = new_path
 
 
-    def _check_for_new_log_files(self) -> None:
-        """Scan the log directory and update the log_files dictionary."""
-        try:
-            if self.log_path == None or not self.log_path.exists() or not self.log_path.is_dir():
-                print(F"No log path set. {self.log_path}")
-                return
-        except Exception as error:
-            print(F"Failed to load logs: {error = }")
+    def _check_for_new_log_files(self, names: set[str] | None = None) -> None:
+        """Scan the log directory and update the log_files dictionary.
+        If names is given only those files are looked at, otherwise the directory is listed if it has changed."""
+        if self._check_for_new_files(self.log_files, self.log_path, self._log_registry, names, not self._log_dir_scanned):
+            self._log_dir_scanned = True
+
+    
+    def _check_for_new_chatlog_files(self, names: set[str] | None = None) -> None:
+        """Scan the chatlog directory and update the chatlog_files dictionary.
+        If names is given only those files are looked at, otherwise the directory is listed if it has changed."""
+        if self._check_for_new_files(self.chatlog_files, self.chatlog_path, self._chatlog_registry, names, not self._chatlog_dir_scanned):
+            self._chatlog_dir_scanned = True
 
+
+    def _is_log_file(self, filename: str) -> bool:
         # Find files that match the pattern "yohoho_1764097495517.log"
-        for log_file in self.log_path.glob("yohoho_*.log"):
-            if log_file.is_file() and log_file.suffix == ".log":
-                if log_file.name not in self.log_files:
-                    self.log_files[log_file.name] = LogData()
-                    new_file_size = log_file.stat().st_size
-                    print(F"New log file found {log_file.name}: with filesize: {new_file_size}")
-                    self._update_file_size(self.log_files, log_file.name, new_file_size)
+        return self.LOG_NAME_PATTERN.fullmatch(filename) is not None
+
+    def _is_chatlog_file(self, filename: str) -> bool:
+        # Chatlogs have no extension or are .txt
+        return Path(filename).suffix.lower() in ("", ".txt")
+
+
+    def _check_for_new_files(self, directory, dir_path: Path | None, registry: FileRegistry | None,
+                             names: set[str] | None, first_scan: bool) -> bool:
+        """Start tailing new files in dir_path and stop tailing deleted ones. Returns True if anything was looked at."""
+        if dir_path == None or registry == None:
+            return False
+
+        if names is None:
+            start = time.perf_counter_ns()
+            entries = registry.scan()
+            self._scan_time.record_since(start)
+            if entries is None:
+                return False # Nothing has been created, deleted or renamed since the last scan
+            self._remove_missing_files(directory, set(directory) - set(entries))
+            for filename, file_stat in entries.items():
+                self._track_file(directory, dir_path / filename, first_scan, file_stat)
+            self._listed_dirs.add(dir_path)
+            self._prune_checkpoints()
+        else:
+            for filename in names:
+                if registry.accept(filename):
+                    self._track_file(directory, dir_path / filename, first_scan)
+        return True
+
+
+    def _prune_checkpoints(self) -> None:
+        """Once the log and chatlog directories have both been listed, forget the checkpoints of files in neither."""
+        if self._checkpoints_pruned:
+            return
+        paths = [path for path in (self.log_path, self.chatlog_path) if path is not None]
+        if all(path in self._listed_dirs for path in paths):
+            self.checkpoints.prune_unseen()
+            self._checkpoints_pruned = True
 
-    
-    def _check_for_new_chatlog_files(self) -> None:
-        """Scan the chatlog directory and update the chatlog_files dictionary."""
-        try:
-            if self.chatlog_path == None or not self.chatlog_path.exists() or not self.chatlog_path.is_dir():
-                return
-        except Exception as error:
-            print(F"Failed to load chatlogs: {error = }")
-        for chatlog_file in self.chatlog_path.glob("*"):
-            # Checks if it is a file (not a directory) AND has no extension
-            if chatlog_file.is_file() and chatlog_file.suffix.lower() in ("", ".txt"):
-                if chatlog_file.name not in self.chatlog_files:
-                    self.chatlog_files[chatlog_file.name] = LogData()
-                    new_file_size = chatlog_file.stat().st_size
-                    self._update_file_size(self.chatlog_files, chatlog_file.name, new_file_size)
-
-
-    def _update_file_size(self, directory, filename: str, filesize: int) -> None:
-        """Update the size of a specific file in the dictionary."""
-        directory[filename].size = filesize
-
-    def _check_file_size(self, directory, file_path: Path) -> int:
-        """Checks if the filesize has changed, returns the number of new bytes."""
-        # Check if the file exists
+
+    def _track_file(self, directory, file_path: Path, first_scan: bool, file_stat=None) -> None:
+        """Start tailing a file we haven't seen before, or restart one that has been replaced or truncated.
+        file_stat can be passed in if the caller already has it from a directory scan."""
         filename = file_path.name
-        if not file_path.exists() or not file_path.is_file():
-            # Delete from log_files if it no longer exists
-            if filename in directory:
-                del directory[filename]
+        # DirEntry.stat() has no inode on Windows, that needs a real stat
+        if file_stat is None or file_stat.st_ino == 0:
+            try:
+                file_stat = file_path.stat()
+            except OSError:
+                self._remove_missing_files(directory, {filename})
+                return
+        # Checks if it is a file (not a directory)
+        if not stat.S_ISREG(file_stat.st_mode):
+            return
+        key = file_key(file_stat)
+
+        log_data = directory.get(filename)
+        if log_data is not None:
+            if log_data.key != key:
+                print(F"{filename} was replaced, reading it from the start")
+                self._remove_missing_files(directory, {filename})
+                self._add_file(directory, file_path, key, 0)
+            elif file_stat.st_size < log_data.reader.offset:
+                print(F"{filename} was truncated, reading it from the start")
+                log_data.reader.reset(0)
+                self._activity(directory).touch(filename)
+            elif file_stat.st_size > log_data.size:
+                self._activity(directory).touch(filename)
+            return
+
+        # Resume from where we got to last run
+        offset = self.checkpoints.get(key, filename, file_stat.st_size)
+        if offset is None:
+            if first_scan and offset is None and not self.checkpoints.has_name(filename):
+                # Was already there when we started and has never been read, only new lines matter
+                offset = file_stat.st_size
+            else:
+                # Created since we started, replaced or truncated while we were closed
+                offset = 0
+        idle_seconds = time.time() - file_stat.st_mtime
+        if directory is self.log_files:
+            print(F"New log file found {filename}: with filesize: {file_stat.st_size}, reading from {offset}")
+            # The game writes to the yohoho log with the newest epoch in its name
+            epoch = self._log_epoch(filename)
+            if epoch >= self._newest_log_epoch:
+                self._newest_log_epoch = epoch
+                idle_seconds = 0
+        self._add_file(directory, file_path, key, offset, idle_seconds)
+
+
+    def _log_epoch(self, filename: str) -> int:
+        """The epoch in milliseconds from a name like yohoho_1764097495517.log, 0 if there isn't one."""
+        try:
+            return int(filename[len("yohoho_"):-len(".log")])
+        except ValueError:
             return 0
+
+
+    def _activity(self, directory) -> ActivityTracker:
+        return self._log_activity if directory is self.log_files else self._chatlog_activity
+
+
+    def _add_file(self, directory, file_path: Path, key: str, offset: int, idle_seconds: float = 0.0) -> None:
+        """Start tailing a file from the given byte offset."""
+        directory[file_path.name] = LogData(key, offset, IncrementalReader(file_path, offset),
+                                            metrics.counter("lines_read", file=file_path.name))
+        # Saved now, not on the first read, so a file that is never read this run still resumes from here
+        self.checkpoints.set(key, file_path.name, offset)
+        self._activity(directory).add(file_path.name, idle_seconds)
+
+
+    def _remove_missing_files(self, directory, filenames: set[str]) -> None:
+        """Stop tailing files that no longer exist."""
+        for filename in filenames:
+            log_data = directory.pop(filename, None)
+            if log_data is not None and log_data.reader is not None:
+                log_data.reader.close()
+                self.checkpoints.forget(log_data.key)
+            self._activity(directory).remove(filename)
+
+
+    def _read_new_chunk(self, directory, filename: str) -> str:
+        """Returns the complete lines appended to a file since it was last read, as one string."""
+        log_data = directory[filename]
+        try:
+            chunk = log_data.reader.read_chunk()
+            # Truncating a file doesn't touch its directory, so when polling nothing else would notice
+            if not chunk and log_data.reader.truncated():
+                print(F"{filename} was truncated, reading it from the start")
+                log_data.reader.reset(0)
+                chunk = log_data.reader.read_chunk()
+        except OSError as error:
+            print(F"Failed to read {filename}: {error}")
+            self._remove_missing_files(directory, {filename})
+            return ""
+        if chunk:
+            self._activity(directory).touch(filename)
+            log_data.lines_read.inc(chunk.count("\n"))
+        log_data.size = log_data.reader.offset
+        self.checkpoints.set(log_data.key, filename, log_data.size)
+        return chunk
+
+    def _read_new_lines(self, directory, filename: str) -> list[str]:
+        """Returns the complete lines appended to a file since it was last read."""
+        chunk = self._read_new_chunk(directory, filename)
+        return chunk.splitlines() if chunk else []
+
+
+    def _due_files(self, directory, dir_path: Path) -> list[str]:
+        """When polling, the files worth reading this tick. Hot files every tick, warm ones every few seconds,
+        and cold ones only if a stat shows they've been written to."""
+        activity = self._activity(directory)
+        to_read, to_stat, cooled = activity.due()
+        for filename in cooled:
+            # Release the handle, it is reopened if the file ever warms up again
+            directory[filename].reader.close()
+        for filename in to_stat:
+            self._track_file(directory, dir_path / filename, False)
+            if activity.state.get(filename) == HOT:
+                to_read.append(filename)
+        return to_read
+
         
-        current_size = file_path.stat().st_size
-        last_size = directory[filename].size
-        if current_size > last_size:
-            new_bytes = current_size - last_size
-            return new_bytes
-        return 0
-        
-    def _process_logs(self, log_file_path: Path, new_bytes: int) -> None:
+    def _process_logs(self, filename: str) -> None:
         """Process new log entries from the specified log file."""
-        filename = log_file_path.name
-        directory = self.log_files
-        last_size = self.log_files[filename].size
-        current_size = last_size + new_bytes
-
-        with log_file_path.open("r", encoding="utf-8") as fh:
-            fh.seek(last_size)
-            new_data = fh.read()
-            for line in new_data.splitlines():
-                for pattern, mode in self.LOG_EVENT_PATTERNS:
-                    if pattern in line:
-                        # print(F"Pattern matched: {pattern}")
-                        self._emit(mode=mode, data=line)
-
-        # Update the last read size
-        self._update_file_size(directory, filename, current_size)
-            
+        chunk = self._read_new_chunk(self.log_files, filename)
+        if chunk:
+            self.process_log_chunk(chunk)
 
     
-    def _process_chatlogs(self, chatlog_file_path: Path, new_bytes: int) -> None:
+    def _process_chatlogs(self, filename: str) -> None:
         """Process new chatlog entries from the specified chatlog file."""
-        filename = chatlog_file_path.name
-        directory = self.chatlog_files
-        last_size = self.chatlog_files[filename].size
-        current_size = last_size + new_bytes
-
-        with chatlog_file_path.open("r", encoding="utf-8", errors="replace") as fh:
-            fh.seek(last_size)
-            new_data = fh.read()
-            for line in new_data.splitlines():
-                for pattern, mode in self.LOG_EVENT_PATTERNS:
-                    if pattern in line:
-                        self._emit(mode=mode, data=line)
-                self.apply_custom_chatlog_filters(line)
-
-        # Update the last read size
-        self._update_file_size(directory, filename, current_size)
-
-
-    def apply_custom_chatlog_filters(self, line): #TODO add ability to click to copy pirates name to clipboard
-        line_lower = line.lower()
-        
-        buy_parts = []
-        sell_parts = []
-
+        for line in self._read_new_lines(self.chatlog_files, filename):
+            self.process_chat_line(line)
+
+
+    def process_log_line(self, line: str) -> None:
+        """Emits a GameEvent for each event pattern in a yohoho log line."""
+        start = time.perf_counter_ns()
+        events = self.event_matcher.matched_payloads(line)
+        self._log_match_time.record_since(start)
+        for pattern, mode in events:
+            # print(F"Pattern matched: {pattern}")
+            self._emit(GameEvent(line, pattern, mode))
+
+
+    def process_log_chunk(self, chunk: str) -> None:
+        """Same as process_log_line for every line of chunk. Nearly every yohoho log line is noise,
+        so the chunk is searched as a whole and only the lines with a pattern in them are split out."""
+        start = time.perf_counter_ns()
+        hits = []
+        for line_start, line_end in self.event_matcher.matching_lines(chunk):
+            # splitlines() also breaks on the likes of \r, same as when the chunk was split into lines
+            for line in chunk[line_start:line_end].splitlines():
+                events = self.event_matcher.matched_payloads(line)
+                if events:
+                    hits.append((line, events))
+        self._log_match_time.record_since(start)
+        for line, events in hits:
+            for pattern, mode in events:
+                self._emit(GameEvent(line, pattern, mode))
+
+
+    def process_chat_line(self, line: str) -> ChatLine:
+        """Emits the events and filter matches for a chatlog line. Returns the parsed line."""
+        for pattern, mode in self.event_matcher.matched_payloads(line):
+            self._emit(GameEvent(line, pattern, mode))
+        start = time.perf_counter_ns()
+        record = parse_chat_line(line)
+        self.apply_custom_chatlog_filters(record)
+        # Includes emitting any matches, the emit histogram has that part on its own
+        self._chat_match_time.record_since(start)
+        return record
+
+
+    def get_filter_plan(self) -> FilterPlan:
+        """Returns the compiled filters, rebuilding them only if they have been edited since the last call."""
+        plan = self._filter_plan
+        if plan is None or plan.revision != self.configs.filters_revision:
+            plan = FilterPlan(self.configs.search_strings, self.configs.filters_revision)
+            self._filter_plan = plan
+            self.trade_memo.clear()
+        return plan
+
+
+    def apply_custom_chatlog_filters(self, line: str | ChatLine): #TODO add ability to click to copy pirates name to clipboard
+        """Run every enabled filter over a chatlog line, emitting a FilterMatchEvent for each filter that matches."""
         if self.configs.chat_filter_off: # All filters have been disabled
             return
 
-        # Iterate over the SearchEntry objects
-        for key, entry in self.configs.search_strings.items():
-            
-            # 1. Check if the filter is enabled
-            if not entry.on_off:
-                continue
+        record = line if isinstance(line, ChatLine) else parse_chat_line(line)
+        line = record.line
+        line_lower = record.lower
+        line_channel = record.channel # None if the line is too short to have one
 
-            buy_and_sell_split = False
+        # Only the filters for this line's channel (index 2 of the line) and the channel-less ones
+        plan = self.get_filter_plan()
+        bucket = plan.bucket_for(line_channel)
+        if not bucket.filters:
+            return
 
-            # 2. Channel Check (Preserving original logic for log format parsing)
-            # Assuming entry.channel is a string like "trade", "global", etc.
-            try:
-                # Matches old logic: checks if specific channel is set and matches log line index 2
-                if entry.channel and entry.channel != line_lower.split(" ")[2]:
-                    continue
-            except IndexError:
-                continue # line is part of a multiline message or format is otherwise wrong
-
-            # 3. Regex Logic
-            if entry.string_or_regex == "Regex":
-                if entry.regex and re.search(entry.regex, line_lower):
-                    self._emit("Filter Match", line, key=key)
-                    #TODO Implement match kwarg to self._emit such that the matching text can be highlighted.
+        trade_found = None
+        if line_channel == "trade" and "trade" in plan.channels:
+            trade_found = self._trade_filter_matches(bucket, record.body_lower)
+            # The channel-less filters still look at the whole line
+            term_matcher = plan.wildcard.term_matcher
+        else:
+            term_matcher = bucket.term_matcher
+
+        # Every string filter term in the line, found in one pass. Filters with no hits can be skipped.
+        hits: dict[int, dict[str, list[tuple[int, int]]]] = {} # filter key -> term -> spans
+        for start, end, key in term_matcher.find_all(line_lower):
+            hits.setdefault(key, {}).setdefault(line_lower[start:end], []).append((start, end))
+
+        # 1. String Logic, only for the filters with a hit, in filter order
+        keys = list(hits)
+        if trade_found:
+            keys.extend(trade_found)
+        if len(keys) > 1:
+            keys.sort(key=bucket.order.__getitem__)
+        for key in keys:
+            compiled = bucket.by_key[key]
+            if compiled.channel == "trade" and trade_found is not None:
+                matches, body_spans = trade_found[key]
+                spans = [(record.body_start + start, record.body_start + end) for start, end in body_spans]
+                self._emit(FilterMatchEvent(line, key, list(matches), spans, record))
                 continue
 
-            # 4. String Logic
-            elif entry.string_or_regex == "Strings":
-                search_terms = []
-                # Split by pipe and strip whitespace
-                search_terms.extend([term.strip() for term in entry.strings.split('|') if term.strip()])
-
-                if entry.channel == "trade":
-                    if not buy_and_sell_split:
-                        buy_parts, sell_parts = self.split_buy_and_sell(line_lower)
-                        buy_and_sell_split = True
-                    
-                    # Logic: If I want to BUY, I search the 'sell_parts' of the message
-                    if entry.buy_or_sell.lower() == "buy":
-                        for term in search_terms:
-                            for part in sell_parts:
-                                if term in part:
-                                    self._emit("Filter Match", line, key=key, match=term)
-                    
-                    # Logic: If I want to SELL, I search the 'buy_parts' of the message
-                    elif entry.buy_or_sell.lower() == "sell":
-                        for term in search_terms:
-                            for part in buy_parts:
-                                if term in part:
-                                    self._emit("Filter Match", line, key=key, match=term)
-                else:
-                    # Standard channel search (Global, Crew, etc.)
-                    for term in search_terms:
-                        if term in line_lower:
-                            self._emit("Filter Match", line, key=key, match=term)
+            # Standard channel search (Global, Crew, etc.)
+            found = hits[key]
+            # Keep the order the terms were written in
+            matches = [term for term in compiled.terms if term in found]
+            spans = [span for term in matches for span in found[term]]
+            self._emit(FilterMatchEvent(line, key, matches, spans, record))
+
+        # 2. Regex Logic
+        for compiled in bucket.regex_filters:
+            match = compiled.regex.search(line_lower)
+            if match:
+                self._emit(FilterMatchEvent(line, compiled.key, [match.group()], [match.span()], record))
+
+
+    def _trade_filter_matches(self, bucket, body: str) -> dict:
+        """{filter key: (matched terms, (start, end) spans within body)} for the trade filters that
+        match a trade message. Remembered per body in trade_memo, traders repost the same message a lot."""
+        tokenizer = self.get_trade_tokenizer() # First, as a new one clears the memo
+        result = self.trade_memo.get(body)
+        if result is not None:
+            return result
+
+        terms_found: dict[int, set[str]] = {}
+        for start, end, key in bucket.term_matcher.find_all(body):
+            terms_found.setdefault(key, set()).add(body[start:end])
+
+        result = {}
+        buy_spans = None
+        sell_spans = None
+        for key, found in terms_found.items():
+            compiled = bucket.by_key[key]
+            if compiled.channel != "trade":
+                continue # A channel-less filter, matched against the whole line instead
+            if buy_spans is None:
+                # Only the message is split, so a keyword in the speaker's name doesn't count
+                buy_spans, sell_spans = tokenizer.spans(body)
+
+            # Logic: If I want to BUY, I search the sell parts of the message, and vice versa
+            if compiled.side == "buy":
+                spans = sell_spans
+            elif compiled.side == "sell":
+                spans = buy_spans
+            else:
+                continue
+
+            # Gather every hit so the line fans out to sounds and Discord once for this filter
+            matches = []
+            match_spans = []
+            for term in compiled.terms:
+                if term not in found:
+                    continue
+                for start, end in spans:
+                    position = body.find(term, start, end)
+                    if position != -1:
+                        if not matches or matches[-1] != term:
+                            matches.append(term)
+                        match_spans.append((position, position + len(term)))
+            if matches:
+                result[compiled.key] = (tuple(matches), tuple(match_spans))
+
+        self.trade_memo.put(body, result)
+        return result
 
     
-    def split_buy_and_sell(self, message: str) -> tuple[list[str], list[str]]:
-        buy_set = {k.lower() for k in self.BUY_STRINGS}
-        sell_set = {k.lower() for k in self.SELL_STRINGS}
-
-        all_keywords = sorted(buy_set | sell_set, key=len, reverse=True)
-        if not all_keywords:
-            return [], []
-
-        # Match any keyword literally, case-insensitive
-        pattern = "(" + "|".join(re.escape(k) for k in all_keywords) + ")"
-        matches = list(re.finditer(pattern, message, flags=re.IGNORECASE))
-
-        if not matches:
-            return [], []
-
-        buy_parts = []
-        sell_parts = []
-
-        for i, m in enumerate(matches):
-            start = m.start()
-            end = matches[i + 1].start() if i + 1 < len(matches) else len(message)
-            segment = message[start:end].strip()
-            keyword = m.group(1).lower()
-            if keyword in buy_set:
-                buy_parts.append(segment)
-            else:
-                sell_parts.append(segment)
+    def get_trade_tokenizer(self) -> TradeTokenizer:
+        """Returns the buy/sell splitter, recompiling it only if the keyword lists have changed."""
+        tokenizer = self._trade_tokenizer
+        if tokenizer is None or tokenizer.key != (tuple(self.BUY_STRINGS), tuple(self.SELL_STRINGS)):
+            tokenizer = TradeTokenizer(self.BUY_STRINGS, self.SELL_STRINGS)
+            self._trade_tokenizer = tokenizer
+            self.trade_memo.clear()
+        return tokenizer
 
-        return buy_parts, sell_parts
+
+    def split_buy_and_sell(self, message: str) -> tuple[list[str], list[str]]:
+        return self.get_trade_tokenizer().split(message)
     
         
-    def update_logs(self) -> None:
-        """Main log update function to check for and process new data in log files."""
-        self._check_for_new_log_files()
-        for filename in list(self.log_files.keys()):
-            log_file_path = self.log_path / filename
-            new_bytes = self._check_file_size(self.log_files, log_file_path)
-            if new_bytes > 0:
-                # There are new bytes to read. Start reading from last_size
-                self._process_logs(log_file_path, new_bytes)
-
+    def update_logs(self, changed: set[str] | None = None) -> None:
+        """Main log update function to check for and process new data in log files.
+        changed is the set of filenames the watcher saw change, None means check whichever files are due."""
+        self._check_for_new_log_files(changed)
+        filenames = self._due_files(self.log_files, self.log_path) if changed is None else [name for name in changed if name in self.log_files]
+        for filename in filenames:
+            self._process_logs(filename)
+
+    def update_chatlogs(self, changed: set[str] | None = None) -> None:
+        """Main chatlog update function to check for and process new data in chatlog files.
+        changed is the set of filenames the watcher saw change, None means check whichever files are due."""
+        self._check_for_new_chatlog_files(changed)
+        filenames = self._due_files(self.chatlog_files, self.chatlog_path) if changed is None else [name for name in changed if name in self.chatlog_files]
+        for filename in filenames:
+            self._process_chatlogs(filename)
+
+
+    def _stop_tailing(self, directory) -> None:
+        """Close every file in directory, keeping their checkpoints for next time."""
+        for log_data in directory.values():
+            log_data.reader.close()
+        directory.clear()
+
+
+    def _apply_path_changes(self) -> None:
+        """Swap over to any new paths set since the last update and point the watcher at them."""
         if self.new_log_path != None:
             print(F"Log Path changed to {self.new_log_path}")
+            if self.log_path != None:
+                self.watcher.unwatch(self.log_path)
             self.log_path = self.new_log_path
             self.new_log_path = None
+            self._stop_tailing(self.log_files)
+            self._log_activity.clear()
+            self._newest_log_epoch = 0
+            self._log_dir_scanned = False
+            self._log_registry = FileRegistry(self.log_path, self._is_log_file)
+            self.watcher.watch(self.log_path)
 
-    def update_chatlogs(self) -> None:
-        """Main chatlog update function to check for and process new data in chatlog files."""
-        self._check_for_new_chatlog_files()
-        for filename in list(self.chatlog_files.keys()):
-            chatlog_file_path = self.chatlog_path / filename
-            new_bytes = self._check_file_size(self.chatlog_files, chatlog_file_path)
-            if new_bytes > 0:
-                # There are new bytes to read. Start reading from last_size
-                self._process_chatlogs(chatlog_file_path, new_bytes)
-        
         if self.new_chatlog_path != None:
-            print(F"Chatlog Path changed to {self.log_path}")
+            print(F"Chatlog Path changed to {self.new_chatlog_path}")
+            if self.chatlog_path != None:
+                self.watcher.unwatch(self.chatlog_path)
             self.chatlog_path = self.new_chatlog_path
             self.new_chatlog_path = None
+            self._stop_tailing(self.chatlog_files)
+            self._chatlog_activity.clear()
+            self._chatlog_dir_scanned = False
+            self._chatlog_registry = FileRegistry(self.chatlog_path, self._is_chatlog_file)
+            self.watcher.watch(self.chatlog_path)
+
 
-    
     def update_all_logs(self):
-        self.update_chatlogs()
-        self.update_logs()
\ No newline at end of file
+        """Processes whatever the watcher reports as changed. Returns quickly if nothing has."""
+        self._apply_path_changes()
+        changes = self.watcher.read_changes()
+        if self.watcher.reports_names:
+            # inotify asking for a full rescan means it lost track, the directory mtime can't be trusted either
+            if changes.get(self.chatlog_path, ()) is None and self._chatlog_registry:
+                self._chatlog_registry.invalidate()
+            if changes.get(self.log_path, ()) is None and self._log_registry:
+                self._log_registry.invalidate()
+        if self.chatlog_path in changes:
+            self.update_chatlogs(changes[self.chatlog_path])
+        if self.log_path in changes:
+            self.update_logs(changes[self.log_path])
+        self.checkpoints.maybe_save()
+
+
+    def close(self) -> None:
+        """Save how far every file has been read and release the file handles."""
+        self.checkpoints.save()
+        self._stop_tailing(self.log_files)
+        self._stop_tailing(self.chatlog_files)
+        self.watcher.close()
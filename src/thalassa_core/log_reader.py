@@ -0,0 +1,98 @@
+from pathlib import Path
+import os
+import time
+
+from thalassa_core.metrics import metrics
+
+_read_time = metrics.histogram("read")
+_decode_time = metrics.histogram("decode")
+_bytes_read = metrics.counter("bytes_read")
+
+
+class IncrementalReader():
+    """Tails a single file in binary mode, returning only complete lines.
+
+    The handle stays open between reads so each tick is a single read() call. Bytes after the
+    last newline are carried over to the next read, which means a half flushed line is matched
+    once it is complete rather than as a fragment, and a multibyte character split across two
+    writes is never decoded in halves."""
+    __slots__ = ("path", "offset", "encoding", "errors", "_fh", "_carry")
+
+    def __init__(self, path: Path, offset: int = 0, encoding: str = "utf-8", errors: str = "replace") -> None:
+        self.path = Path(path)
+        self.offset = offset  # Byte offset just past the last complete line returned
+        self.encoding = encoding
+        self.errors = errors
+        self._fh = None
+        self._carry = b""
+
+    def _open(self) -> None:
+        self._fh = self.path.open("rb")
+        self._fh.seek(self.offset)
+
+    def read_chunk(self, max_bytes: int = -1) -> str:
+        """Returns every complete line written since the last call as one string, or "" if there are none.
+        With max_bytes, reads no more than that and leaves the rest for the next call.
+        Raises OSError if the file can no longer be opened."""
+        if self._fh is None:
+            self._open()
+
+        start = time.perf_counter_ns()
+        data = self._fh.read(max_bytes)
+        _read_time.record_since(start)
+        if not data:
+            return ""
+        _bytes_read.inc(len(data))
+
+        buffer = self._carry + data if self._carry else data
+        end = buffer.rfind(b"\n")
+        if end == -1:
+            self._carry = buffer
+            return ""
+
+        self._carry = buffer[end + 1:]
+        self.offset += end + 1
+        start = time.perf_counter_ns()
+        text = buffer[:end + 1].decode(self.encoding, self.errors)
+        _decode_time.record_since(start)
+        return text
+
+    def read_lines(self) -> list[str]:
+        """Returns the complete lines written since the last call."""
+        chunk = self.read_chunk()
+        return chunk.splitlines() if chunk else []
+
+    def iter_chunks(self, block_size: int = 1024 * 1024):
+        """Yields what read_chunk would return, reading block_size bytes at a time
+        so a large file never has to be held in memory at once."""
+        while True:
+            position = self.offset + len(self._carry)
+            chunk = self.read_chunk(block_size)
+            if chunk:
+                yield chunk
+            elif self.offset + len(self._carry) == position:
+                return # Nothing more has been written
+
+    def iter_lines(self, block_size: int = 1024 * 1024):
+        """Yields the complete lines written since the last call, block_size bytes at a time."""
+        for chunk in self.iter_chunks(block_size):
+            yield from chunk.splitlines()
+
+    def truncated(self) -> bool:
+        """True if the open file is now shorter than what has been read of it, i.e. it was truncated in place.
+        Costs an fstat, so only worth asking when a read has come back empty."""
+        if self._fh is None:
+            return False
+        return os.fstat(self._fh.fileno()).st_size < self.offset
+
+    def reset(self, offset: int = 0) -> None:
+        """Start reading again from offset, e.g. after the file has been truncated."""
+        self.close()
+        self.offset = offset
+
+    def close(self) -> None:
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+        # Reopening resumes from the last complete line
+        self._carry = b""
@@ -0,0 +1,99 @@
+import queue
+import threading
+import time
+
+from thalassa_core.metrics import metrics
+from thalassa_core.events import GameEvent, FilterMatchEvent
+
+
+class LogTailer(threading.Thread):
+    """Runs a LogParser on a background thread so file I/O and filter matching never block Tk.
+    Events are pushed onto a bounded queue which the GUI drains on its own schedule.
+    If the GUI falls behind and the queue fills up, new events are dropped and counted."""
+    def __init__(self, log_parser, max_queue_size: int = 2000, poll_interval: float = 0.05) -> None:
+        super().__init__(name="LogTailer", daemon=True)
+        self.log_parser = log_parser
+        self.poll_interval = poll_interval
+
+        self.events: queue.Queue[GameEvent | FilterMatchEvent] = queue.Queue(maxsize=max_queue_size)
+        self.enqueued = 0
+        self.dropped = 0
+        self.max_depth = 0
+
+        self._stop_event = threading.Event()
+        # Whoever is last out of stop() and run() closes the parser when asked to, never while it's mid update
+        self._close_lock = threading.Lock()
+        self._close_parser = False
+        self._finished = False
+        self.log_parser.event_callback = self._enqueue
+
+        self._dropped_counter = metrics.counter("ingest_dropped")
+        metrics.gauge("ingest_queue_depth", self.events.qsize)
+        metrics.gauge("ingest_queue_max_depth", lambda: self.max_depth)
+
+    def _enqueue(self, event) -> None:
+        """Replaces the parser's event callback, runs on the tailer thread."""
+        try:
+            self.events.put_nowait(event)
+        except queue.Full:
+            self.dropped += 1
+            self._dropped_counter.inc()
+            return
+        self.enqueued += 1
+        depth = self.events.qsize()
+        if depth > self.max_depth:
+            self.max_depth = depth
+
+    def run(self) -> None:
+        watcher = self.log_parser.watcher
+        try:
+            while not self._stop_event.is_set():
+                # Wakes early when inotify has something, otherwise this is the poll interval
+                watcher.wait(self.poll_interval)
+                try:
+                    self.log_parser.update_all_logs()
+                except Exception as error:
+                    print(F"Log tailer failed to update logs: {error}")
+        finally:
+            with self._close_lock:
+                self._finished = True
+                if self._close_parser:
+                    self.log_parser.close()
+
+    def stop(self, close_parser: bool = False) -> None:
+        """With close_parser the parser is closed, saving its checkpoints, once the thread is out of its
+        last update. Straight away if the thread has already finished."""
+        with self._close_lock:
+            self._close_parser = close_parser
+            if close_parser and self._finished:
+                self.log_parser.close()
+        self._stop_event.set()
+
+    def drain(self, callback, budget: float = 0.01) -> int:
+        """Hand queued events to callback until the queue is empty or budget seconds have passed.
+        Runs on the GUI thread. Returns the number of events delivered."""
+        deadline = time.perf_counter() + budget
+        delivered = 0
+        while True:
+            try:
+                event = self.events.get_nowait()
+            except queue.Empty:
+                break
+            callback(event)
+            delivered += 1
+            if time.perf_counter() >= deadline:
+                break
+        return delivered
+
+    @property
+    def queue_depth(self) -> int:
+        return self.events.qsize()
+
+    def stats(self) -> dict[str, int]:
+        """Backpressure counters for the ingestion queue."""
+        return {
+            "queue_depth": self.queue_depth,
+            "max_depth": self.max_depth,
+            "enqueued": self.enqueued,
+            "dropped": self.dropped,
+        }
@@ -0,0 +1,56 @@
+from collections import OrderedDict
+
+from thalassa_core.metrics import metrics
+
+_MISSING = object()
+
+
+class LRUMemo():
+    """A bounded cache that forgets the least recently used entry once it is full.
+    Hits and misses are counted here for stats() and as the memo_hits/memo_misses metrics,
+    so the size can be tuned from the Debug panel."""
+    def __init__(self, name: str, max_entries: int) -> None:
+        self.name = name
+        self.max_entries = max_entries
+        self._entries: OrderedDict = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self._hit_counter = metrics.counter("memo_hits", cache=name)
+        self._miss_counter = metrics.counter("memo_misses", cache=name)
+        metrics.gauge("memo_size", lambda: len(self._entries), cache=name)
+
+    def get(self, key, default=None):
+        value = self._entries.get(key, _MISSING)
+        if value is _MISSING:
+            self.misses += 1
+            self._miss_counter.inc()
+            return default
+        self._entries.move_to_end(key)
+        self.hits += 1
+        self._hit_counter.inc()
+        return value
+
+    def put(self, key, value) -> None:
+        if self.max_entries <= 0:
+            return
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Forget everything, e.g. when whatever the values were worked out from has changed."""
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,219 @@
+from contextlib import contextmanager
+from pathlib import Path
+import json
+import threading
+import time
+
+# Each power of two is split into 2**SUB_BUCKET_BITS buckets, so a recorded value is
+# never more than about 3% away from the value reported for its bucket.
+SUB_BUCKET_BITS = 5
+SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+
+
+def _bucket_index(value: int) -> int:
+    exponent = value.bit_length() - SUB_BUCKET_BITS - 1
+    if exponent <= 0:
+        return value
+    return (exponent << SUB_BUCKET_BITS) + (value >> exponent)
+
+
+def _bucket_value(index: int) -> int:
+    """The lowest value that lands in a bucket."""
+    exponent = max(index // SUB_BUCKETS - 1, 0)
+    return (index - (exponent << SUB_BUCKET_BITS)) << exponent
+
+
+class Histogram():
+    """Latency histogram in the style of HdrHistogram: log-linear buckets with a fixed relative
+    precision, so recording is a couple of integer operations and memory stays small
+    whatever range of values turns up. Values are nanoseconds.
+
+    Recording takes a lock of its own, so the exporter thread can read the buckets while other
+    threads keep recording. It is never contended for long enough to show up in the timings."""
+    __slots__ = ("buckets", "count", "total", "min", "max", "_lock")
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.buckets: dict[int, int] = {}
+        self.count = 0
+        self.total = 0
+        self.min = 0
+        self.max = 0
+
+    def record(self, value: int) -> None:
+        value = max(int(value), 0)
+        index = _bucket_index(value)
+        with self._lock:
+            self.buckets[index] = self.buckets.get(index, 0) + 1
+            if self.count == 0 or value < self.min:
+                self.min = value
+            if value > self.max:
+                self.max = value
+            self.count += 1
+            self.total += value
+
+    def record_since(self, start_ns: int) -> None:
+        """Records the time since a time.perf_counter_ns() taken earlier."""
+        self.record(time.perf_counter_ns() - start_ns)
+
+    @contextmanager
+    def time(self):
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.record_since(start)
+
+    def sorted_buckets(self) -> list[tuple[int, int]]:
+        """(bucket index, count) pairs copied under the lock, safe to go through while recording carries on."""
+        with self._lock:
+            return sorted(self.buckets.items())
+
+    def percentile(self, fraction: float) -> int:
+        with self._lock:
+            buckets = sorted(self.buckets.items())
+            count, low, high = self.count, self.min, self.max
+        if count == 0:
+            return 0
+        target = max(fraction * count, 1)
+        seen = 0
+        for index, bucket_count in buckets:
+            seen += bucket_count
+            if seen >= target:
+                return min(max(_bucket_value(index + 1) - 1, low), high)
+        return high
+
+    def cumulative(self, bounds) -> list[int]:
+        """For each bound in ascending bounds, how many values were recorded at or below it.
+        A bucket counts once its lowest value is at or below the bound, so every value up to
+        the bound is included, along with any in the same bucket that are at most 3% above it."""
+        buckets = self.sorted_buckets()
+        counts = []
+        position = 0
+        total = 0
+        for bound in bounds:
+            while position < len(buckets) and _bucket_value(buckets[position][0]) <= bound:
+                total += buckets[position][1]
+                position += 1
+            counts.append(total)
+        return counts
+
+    def reset(self) -> None:
+        with self._lock:
+            self.buckets = {}
+            self.count = self.total = self.min = self.max = 0
+
+    def snapshot(self) -> dict:
+        """Summary in milliseconds."""
+        to_ms = lambda ns: round(ns / 1e6, 3)
+        return {
+            "count": self.count,
+            "mean_ms": to_ms(self.total / self.count) if self.count else 0.0,
+            "min_ms": to_ms(self.min),
+            "p50_ms": to_ms(self.percentile(0.50)),
+            "p90_ms": to_ms(self.percentile(0.90)),
+            "p99_ms": to_ms(self.percentile(0.99)),
+            "max_ms": to_ms(self.max),
+        }
+
+
+class Counter():
+    __slots__ = ("value",)
+
+    def __init__(self) -> None:
+        self.value = 0
+
+    def inc(self, amount: int = 1) -> None:
+        self.value += amount
+
+
+def _metric_key(name: str, labels: dict) -> tuple:
+    return (name, tuple(sorted(labels.items())))
+
+
+def _metric_name(key: tuple) -> str:
+    name, labels = key
+    if not labels:
+        return name
+    return name + "{" + ",".join(F"{label}={value}" for label, value in labels) + "}"
+
+
+class MetricsRegistry():
+    """Every counter, histogram and gauge in the app, looked up by name and labels.
+
+    Callers on hot paths should look their metric up once and keep it. Updates aren't locked,
+    a count can be off by one when two threads race but nothing slows down for it."""
+    def __init__(self) -> None:
+        self.counters: dict[tuple, Counter] = {}
+        self.histograms: dict[tuple, Histogram] = {}
+        self.gauges: dict[tuple, object] = {}  # Functions returning the current value
+        self.started = time.time()
+        self._lock = threading.Lock()  # Only guards creating metrics
+
+    def counter(self, name: str, **labels) -> Counter:
+        key = _metric_key(name, labels)
+        counter = self.counters.get(key)
+        if counter is None:
+            with self._lock:
+                counter = self.counters.setdefault(key, Counter())
+        return counter
+
+    def histogram(self, name: str, **labels) -> Histogram:
+        key = _metric_key(name, labels)
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = self.histograms.setdefault(key, Histogram())
+        return histogram
+
+    def gauge(self, name: str, function, **labels) -> None:
+        """Registers a function that is called for the value whenever metrics are read."""
+        with self._lock:
+            self.gauges[_metric_key(name, labels)] = function
+
+    def gauge_values(self) -> dict[tuple, float]:
+        values = {}
+        for key, function in list(self.gauges.items()):
+            try:
+                values[key] = function()
+            except Exception as error:
+                print(F"Failed to read gauge {_metric_name(key)}: {error}")
+        return values
+
+    def reset(self) -> None:
+        for counter in list(self.counters.values()):
+            counter.value = 0
+        for histogram in list(self.histograms.values()):
+            histogram.reset()
+        self.started = time.time()
+
+    def snapshot(self) -> dict:
+        # Sorted by the printed name, label values can be a mix of types
+        by_name = lambda metrics: sorted(((_metric_name(key), metric) for key, metric in list(metrics.items())), key=lambda item: item[0])
+        return {
+            "uptime_seconds": round(time.time() - self.started, 1),
+            "counters": {name: counter.value for name, counter in by_name(self.counters)},
+            "gauges": {name: value for name, value in by_name(self.gauge_values())},
+            "histograms": {name: histogram.snapshot() for name, histogram in by_name(self.histograms)},
+        }
+
+    def format_text(self) -> str:
+        """A plain text table for the debug panel."""
+        snapshot = self.snapshot()
+        lines = [F"Uptime: {snapshot['uptime_seconds']}s", "", "Latency (ms)              count     p50     p90     p99     max"]
+        for name, stats in snapshot["histograms"].items():
+            lines.append(F"{name:24} {stats['count']:>7} {stats['p50_ms']:>7} {stats['p90_ms']:>7} {stats['p99_ms']:>7} {stats['max_ms']:>7}")
+        lines += ["", "Counters"]
+        lines += [F"{name:50} {value:>10}" for name, value in snapshot["counters"].items()]
+        if snapshot["gauges"]:
+            lines += ["", "Gauges"]
+            lines += [F"{name:50} {value:>10}" for name, value in snapshot["gauges"].items()]
+        return "\n".join(lines)
+
+    def dump(self, path: Path) -> None:
+        with Path(path).open("w", encoding="utf-8") as fh:
+            json.dump(self.snapshot(), fh, indent=2)
+
+
+# Shared by everything, so any stage can be instrumented without passing a registry around
+metrics = MetricsRegistry()
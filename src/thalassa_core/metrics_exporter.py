@@ -0,0 +1,131 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import threading
+
+from thalassa_core.metrics import MetricsRegistry, metrics
+
+PREFIX = "thalassa_"
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+# Histogram bucket bounds in seconds, from 50us up to 10s
+BUCKET_BOUNDS = (0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_clashes_reported: set[str] = set() # So a clash is printed once, not on every scrape
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(labels, extra: str = "") -> str:
+    parts = [F'{label}="{_escape(value)}"' for label, value in labels]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _group(metric_dict: dict) -> dict[str, list]:
+    """{(name, labels): metric} -> {name: [(labels, metric)]}, so each name gets one TYPE line."""
+    grouped = {}
+    for (name, labels), metric in list(metric_dict.items()):
+        grouped.setdefault(name, []).append((labels, metric))
+    return grouped
+
+
+def _claim(taken: dict[str, str], kind: str, *names: str) -> bool:
+    """Reserves the exported names for one metric. Two metrics exported under the same name would make
+    the whole scrape invalid, so the second one is left out with a warning."""
+    for name in names:
+        if name in taken:
+            if names[0] not in _clashes_reported:
+                _clashes_reported.add(names[0])
+                print(F"Metric {names[0]} ({kind}) clashes with {name} ({taken[name]}), not exporting it")
+            return False
+    for name in names:
+        taken[name] = kind
+    return True
+
+
+def format_prometheus(registry: MetricsRegistry = metrics) -> str:
+    """Everything in registry in the Prometheus text exposition format.
+    Counters get a _total suffix, histograms are converted to seconds with fixed buckets."""
+    lines = []
+    taken: dict[str, str] = {}
+    for name, series in sorted(_group(registry.counters).items()):
+        if not _claim(taken, "counter", F"{PREFIX}{name}_total"):
+            continue
+        lines.append(F"# TYPE {PREFIX}{name}_total counter")
+        for labels, counter in series:
+            lines.append(F"{PREFIX}{name}_total{_labels(labels)} {counter.value}")
+
+    for name, series in sorted(_group(registry.gauge_values()).items()):
+        if not _claim(taken, "gauge", F"{PREFIX}{name}"):
+            continue
+        lines.append(F"# TYPE {PREFIX}{name} gauge")
+        for labels, value in series:
+            lines.append(F"{PREFIX}{name}{_labels(labels)} {value}")
+
+    for name, series in sorted(_group(registry.histograms).items()):
+        metric = F"{PREFIX}{name}_seconds"
+        if not _claim(taken, "histogram", metric, F"{metric}_bucket", F"{metric}_sum", F"{metric}_count"):
+            continue
+        lines.append(F"# TYPE {metric} histogram")
+        for labels, histogram in series:
+            counts = histogram.cumulative([bound * 1e9 for bound in BUCKET_BOUNDS])
+            for bound, count in zip(BUCKET_BOUNDS, counts):
+                le = F'le="{bound}"'
+                lines.append(F"{metric}_bucket{_labels(labels, le)} {count}")
+            inf = 'le="+Inf"'
+            lines.append(F"{metric}_bucket{_labels(labels, inf)} {histogram.count}")
+            lines.append(F"{metric}_sum{_labels(labels)} {histogram.total / 1e9}")
+            lines.append(F"{metric}_count{_labels(labels)} {histogram.count}")
+    return "\n".join(lines) + "\n"
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    registry = metrics
+
+    def do_GET(self):
+        if self.path.split("?", 1)[0] not in ("/", "/metrics"):
+            self.send_error(404)
+            return
+        body = format_prometheus(self.registry).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass # Scraped every few seconds, not worth printing
+
+
+class MetricsExporter():
+    """Serves the metrics registry at http://127.0.0.1:<port>/metrics for Prometheus to scrape.
+    Only ever bound to localhost, runs on its own daemon thread."""
+    def __init__(self, port: int = 9464, registry: MetricsRegistry = metrics, host: str = "127.0.0.1") -> None:
+        self.port = port
+        self.host = host
+        self.registry = registry
+        self.server: ThreadingHTTPServer | None = None
+        self.thread: threading.Thread | None = None
+
+    def start(self) -> bool:
+        """Returns False if the port couldn't be bound."""
+        handler = type("MetricsHandler", (_MetricsHandler,), {"registry": self.registry})
+        try:
+            self.server = ThreadingHTTPServer((self.host, self.port), handler)
+        except OSError as error:
+            print(F"Failed to start metrics exporter on {self.host}:{self.port}: {error}")
+            self.server = None
+            return False
+        self.server.daemon_threads = True
+        self.port = self.server.server_address[1] # In case port 0 asked for any free port
+        self.thread = threading.Thread(target=self.server.serve_forever, name="MetricsExporter", daemon=True)
+        self.thread.start()
+        print(F"Serving metrics at http://{self.host}:{self.port}/metrics")
+        return True
+
+    def stop(self) -> None:
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
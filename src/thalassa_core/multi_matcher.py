@@ -0,0 +1,122 @@
+from collections import deque
+import re
+
+
+class MultiPatternMatcher():
+    """Aho-Corasick automaton over a fixed set of literal patterns.
+
+    Built once, then every occurrence of every pattern in a line is found in a single pass,
+    so the cost per line no longer grows with the number of patterns. Each pattern carries one
+    or more payloads (a filter key, an event mode, ...) which are handed back with its matches.
+    A combined regex is checked first so lines containing none of the patterns, which is most
+    of them, are rejected by one C level search."""
+    def __init__(self, patterns=()) -> None:
+        self.patterns: list[str] = []
+        self.payloads: list[list] = []
+        self._pattern_index: dict[str, int] = {}
+
+        for pattern, payload in patterns:
+            self.add(pattern, payload)
+        self.build()
+
+    def add(self, pattern: str, payload) -> None:
+        """Add a pattern, call build() afterwards. Empty patterns are ignored."""
+        if not pattern:
+            return
+        index = self._pattern_index.get(pattern)
+        if index is None:
+            index = len(self.patterns)
+            self._pattern_index[pattern] = index
+            self.patterns.append(pattern)
+            self.payloads.append([])
+        if payload not in self.payloads[index]:
+            self.payloads[index].append(payload)
+
+    def build(self) -> None:
+        """Builds the trie, failure links and prefilter."""
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._output: list[tuple[int, ...]] = [()]
+
+        for index, pattern in enumerate(self.patterns):
+            state = 0
+            for char in pattern:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append(())
+                state = next_state
+            self._output[state] += (index,)
+
+        # Breadth first so a node's failure link is always resolved before its children
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                fail = self._goto[fail].get(char, 0)
+                self._fail[next_state] = fail
+                self._output[next_state] += self._output[fail]
+
+        if self.patterns:
+            longest_first = sorted(self.patterns, key=len, reverse=True)
+            self._prefilter = re.compile("|".join(re.escape(pattern) for pattern in longest_first))
+        else:
+            self._prefilter = None
+
+    def find_all(self, text: str) -> list[tuple[int, int, object]]:
+        """Returns (start, end, payload) for every occurrence of every pattern in text, overlaps included."""
+        if self._prefilter is None or not self._prefilter.search(text):
+            return []
+
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        patterns = self.patterns
+        payloads = self.payloads
+
+        matches = []
+        state = 0
+        for position, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                end = position + 1
+                for index in output[state]:
+                    start = end - len(patterns[index])
+                    for payload in payloads[index]:
+                        matches.append((start, end, payload))
+        return matches
+
+    def matching_lines(self, text: str):
+        """Yields (start, end) of each line of a multi-line text that contains at least one pattern,
+        end being where its newline is. The prefilter does the searching, so lines with no patterns
+        are never looked at one by one."""
+        if self._prefilter is None:
+            return
+        search = self._prefilter.search
+        position = 0
+        while True:
+            match = search(text, position)
+            if match is None:
+                return
+            start = text.rfind("\n", 0, match.start()) + 1
+            end = text.find("\n", match.end())
+            if end == -1:
+                end = len(text)
+            yield start, end
+            position = end + 1
+
+    def matched_payloads(self, text: str) -> list:
+        """Returns each payload found in text once, in the order they were first seen."""
+        seen = {}
+        for _start, _end, payload in self.find_all(text):
+            seen.setdefault(payload, None)
+        return list(seen)
@@ -5,6 +5,9 @@ from pathlib import Path
 from platformdirs import user_data_dir
 import os
 
+from thalassa_core.metrics import metrics
+from thalassa_core.sound_service import sounds
+
 def find_default_log_dir():
     """Checks for the default log directory for puzzle pirates."""
     #TODO: Check Steam paths as well
@@ -260,13 +263,96 @@ class OptionsTab(ttk.Frame):
         browse_btn = ttk.Button(file_select_frame, text="Browse", command=self.browse_sound_file)
         browse_btn.pack(side="left", padx=(5, 0))
         
-        self.rumble_sound_file_var.trace_add("write", lambda *args: setattr(self.configs, 'rumble_warning_sound', self.rumble_sound_file_var.get()))
+        self.rumble_sound_file_var.trace_add("write", lambda *args: self._set_rumble_warning_sound(self.rumble_sound_file_var.get()))
 
         
         # Horizontal line (separator)
         separator = ttk.Separator(self.options_frame, orient="horizontal")
         separator.pack(fill="x", pady=5)
+
+        # Log Settings
+        log_settings_frame = ttk.Frame(self.options_frame)
+        log_settings_frame.pack(pady=10, padx=10, fill="x")
+
+        ttk.Label(log_settings_frame, text="Log Settings").pack(side="top", anchor="w", pady=(0, 5))
+
+        # Threaded Ingestion Checkbox
+        self.threaded_ingest_var = tk.BooleanVar(value=self.configs.threaded_ingest)
+        threaded_ingest_check = ttk.Checkbutton(
+            log_settings_frame,
+            text="Read Logs on a Background Thread (restart required)",
+            variable=self.threaded_ingest_var
+        )
+        threaded_ingest_check.pack(side="top", anchor="w")
+        self.threaded_ingest_var.trace_add("write", lambda *args: setattr(self.configs, 'threaded_ingest', self.threaded_ingest_var.get()))
+
+        # Repost Cooldown Entry
+        repost_cooldown_frame = ttk.Frame(log_settings_frame)
+        repost_cooldown_frame.pack(side="top", anchor="w", pady=(5, 0))
+
+        ttk.Label(repost_cooldown_frame, text="Ignore Reposts For (s):").pack(side="left")
+
+        self.repost_cooldown_var = tk.IntVar(value=int(self.configs.repost_cooldown_seconds))
+        repost_cooldown_entry = ttk.Entry(
+            repost_cooldown_frame,
+            textvariable=self.repost_cooldown_var,
+            width=10
+        )
+        repost_cooldown_entry.pack(side="left", padx=(5, 0))
+        self.repost_cooldown_var.trace_add("write", lambda *args: setattr(self.configs, 'repost_cooldown_seconds', self.repost_cooldown_var.get()))
+
+        # Debug Panel, per-stage timings and counters from metrics.py
+        debug_frame = ttk.Frame(self.options_frame)
+        debug_frame.pack(pady=10, padx=10, fill="x")
+
+        ttk.Label(debug_frame, text="Debug").pack(side="top", anchor="w", pady=(0, 5))
+
+        debug_buttons = ttk.Frame(debug_frame)
+        debug_buttons.pack(side="top", fill="x")
+        ttk.Button(debug_buttons, text="Refresh", command=self.refresh_metrics).pack(side="left", padx=(0, 5))
+        ttk.Button(debug_buttons, text="Reset", command=self.reset_metrics, bootstyle="secondary").pack(side="left", padx=(0, 5))
+        ttk.Button(debug_buttons, text="Dump to File", command=self.dump_metrics, bootstyle="secondary").pack(side="left")
+
+        self.metrics_exporter_var = tk.BooleanVar(value=self.configs.metrics_exporter_on)
+        ttk.Checkbutton(
+            debug_frame,
+            text=F"Serve Metrics on localhost:{self.configs.metrics_exporter_port} (restart required)",
+            variable=self.metrics_exporter_var
+        ).pack(side="top", anchor="w", pady=(5, 0))
+        self.metrics_exporter_var.trace_add("write", lambda *args: setattr(self.configs, 'metrics_exporter_on', self.metrics_exporter_var.get()))
+
+        self.metrics_text = tk.Text(debug_frame, height=14, wrap="none", font=("Courier", 9))
+        self.metrics_text.pack(side="top", fill="x", pady=(5, 0))
+        self.refresh_metrics()
+
+    def refresh_metrics(self):
+        self.metrics_text.configure(state="normal")
+        self.metrics_text.delete("1.0", "end")
+        self.metrics_text.insert("1.0", metrics.format_text())
+        self.metrics_text.configure(state="disabled")
+
+    def reset_metrics(self):
+        metrics.reset()
+        self.refresh_metrics()
+
+    def dump_metrics(self):
+        filename = filedialog.asksaveasfilename(
+            title="Save Metrics",
+            defaultextension=".json",
+            initialfile="thalassa_metrics.json",
+            filetypes=[("JSON", "*.json"), ("All Files", "*.*")]
+        )
+        if filename:
+            try:
+                metrics.dump(Path(filename))
+            except OSError as e:
+                print(f"Failed to save metrics! {e}")
     
+    def _set_rumble_warning_sound(self, sound: str):
+        self.configs.rumble_warning_sound = sound
+        # Decode it now, not when the next rumble warning goes off
+        sounds.refresh()
+
     def browse_sound_file(self):
         # Determine initial directory (OS safe)
         # Assuming script is running from root, constructs ./src/media
@@ -0,0 +1,155 @@
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+import gzip
+import json
+import mmap
+import sys
+
+from thalassa_core.configs import Configs
+from thalassa_core.log_parser import LogParser
+from thalassa_core.events import FilterMatchEvent
+from thalassa_core.forwarding import match_record
+
+CHUNK_SIZE = 8 * 1024 * 1024
+
+# Set up once in each worker process by _init_worker
+_parser: LogParser | None = None
+_matches: list[dict] = []
+
+
+def _is_replayable(path: Path) -> bool:
+    """Chatlogs have no extension or are .txt, optionally gzipped."""
+    if path.suffix.lower() == ".gz":
+        path = path.with_suffix("")
+    return path.suffix.lower() in ("", ".txt")
+
+
+def find_chatlogs(paths: list[Path]) -> list[Path]:
+    """Expands directories into the chatlogs inside them, sorted by name."""
+    files = []
+    for path in paths:
+        if path.is_dir():
+            files.extend(sorted(child for child in path.iterdir() if child.is_file() and _is_replayable(child)))
+        elif path.is_file():
+            files.append(path)
+        else:
+            print(F"Skipping {path}, it does not exist", file=sys.stderr)
+    return files
+
+
+def split_on_lines(path: Path, chunk_size: int = CHUNK_SIZE) -> list[tuple[int, int]]:
+    """Splits a file into (start, end) byte ranges of roughly chunk_size, each ending on a line boundary."""
+    size = path.stat().st_size
+    if size == 0:
+        return []
+    if size <= chunk_size:
+        return [(0, size)]
+
+    ranges = []
+    with path.open("rb") as fh, mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        start = 0
+        while start < size:
+            end = data.find(b"\n", min(start + chunk_size, size) - 1)
+            end = size if end == -1 else end + 1
+            ranges.append((start, end))
+            start = end
+    return ranges
+
+
+def _init_worker(configs: Configs) -> None:
+    global _parser
+    _parser = LogParser(_collect, configs)
+    _parser.watcher.close() # Nothing to watch, only apply_custom_chatlog_filters is used
+
+
+def _collect(event) -> None:
+    if type(event) is FilterMatchEvent:
+        _matches.append(match_record(_parser.configs, event))
+
+
+def _replay_lines(path: Path, lines) -> list[dict]:
+    """Runs (offset, raw bytes) lines through the filters, returning one dict per match."""
+    results = []
+    for offset, raw in lines:
+        _matches.clear()
+        _parser.apply_custom_chatlog_filters(raw.rstrip(b"\r").decode("utf-8", errors="replace"))
+        for match in _matches:
+            match["file"] = str(path)
+            match["offset"] = offset
+            results.append(match)
+    _matches.clear()
+    return results
+
+
+def _mapped_lines(path: Path, start: int, end: int):
+    with path.open("rb") as fh, mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        offset = start
+        while offset < end:
+            newline = data.find(b"\n", offset, end)
+            line_end = end if newline == -1 else newline
+            yield offset, data[offset:line_end]
+            offset = line_end + 1
+
+
+def _gzip_lines(path: Path):
+    # Offsets are into the uncompressed data
+    offset = 0
+    with gzip.open(path, "rb") as fh:
+        for raw in fh:
+            yield offset, raw.rstrip(b"\n")
+            offset += len(raw)
+
+
+def _replay_task(task: tuple[str, int, int]) -> list[dict]:
+    """Worker entry point: replay one byte range of a plain file, or a whole gzipped file."""
+    path, start, end = task
+    path = Path(path)
+    if path.suffix.lower() == ".gz":
+        return _replay_lines(path, _gzip_lines(path))
+    return _replay_lines(path, _mapped_lines(path, start, end))
+
+
+def replay(paths: list[Path], configs: Configs, output, workers: int | None = None, chunk_size: int = CHUNK_SIZE) -> int:
+    """Replays every chatlog in paths through the filters, writing each match to output as a JSON line.
+    Returns the number of matches."""
+    tasks = []
+    for path in find_chatlogs(paths):
+        if path.suffix.lower() == ".gz":
+            tasks.append((str(path), 0, 0)) # gzip can't be split, the whole file is one task
+        else:
+            tasks.extend((str(path), start, end) for start, end in split_on_lines(path, chunk_size))
+
+    total = 0
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(configs,)) as executor:
+        # map keeps the results in file and offset order
+        for results in executor.map(_replay_task, tasks):
+            for match in results:
+                output.write(json.dumps(match) + "\n")
+            total += len(results)
+    return total
+
+
+def add_arguments(parser) -> None:
+    parser.add_argument("paths", nargs="+", type=Path, help="Chatlog files or directories of chatlogs, .gz files are read too")
+    parser.add_argument("--settings", type=Path, default=None, help="Settings file to load the filters from")
+    parser.add_argument("--output", type=Path, default=None, help="Write matches here instead of stdout")
+    parser.add_argument("--workers", type=int, default=None, help="Number of worker processes, defaults to the CPU count")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE // (1024 * 1024), help="Split files into chunks of this many MB")
+
+
+def run(args) -> int:
+    """Backtest the saved filters against archived chatlogs, e.g.
+    uv run src/Thalassa.py replay ~/Documents/YPP_Chatlogs --output matches.jsonl"""
+    configs = Configs()
+    configs.load_configs(args.settings)
+    configs.chat_filter_off = False # The GUI's "All Chats Off" switch shouldn't turn off a backtest
+    configs.checkpoint_file = None
+
+    output = args.output.open("w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        total = replay(args.paths, configs, output, args.workers, args.chunk_size * 1024 * 1024)
+    finally:
+        if args.output:
+            output.close()
+    print(F"{total} matches", file=sys.stderr)
+    return 0
@@ -0,0 +1,72 @@
+from collections import OrderedDict
+import re
+
+from thalassa_core.clock import MonotonicClock
+from thalassa_core.metrics import metrics
+
+# Quotes, punctuation and spacing traders vary between reposts of the same message
+_NOISE_PATTERN = re.compile(r"[\W_]+")
+
+
+def normalize_message(body: str) -> str:
+    """Lowercase words only, so "Selling CI map!!" and "selling ci map" count as the same message."""
+    return _NOISE_PATTERN.sub(" ", body.lower()).strip()
+
+
+class RepostCooldown():
+    """Remembers which (speaker, filter, message) matches have been alerted on recently,
+    so a trader reposting the same line every minute only sets off one sound and one Discord post
+    per configs.repost_cooldown_seconds. Repeats inside the window are counted instead.
+
+    Entries are kept in the order they were last alerted on, so expired ones are always at the
+    front and get dropped as new matches come in. configs.repost_cooldown_max_entries caps the
+    memory, dropping the oldest alerts first."""
+    def __init__(self, configs, clock=None) -> None:
+        self.configs = configs
+        self.clock = clock or MonotonicClock()
+        self._entries: OrderedDict[tuple, list] = OrderedDict()  # key -> [alerted_at, repeats since]
+
+    def key_for(self, key, line: str, record=None) -> tuple:
+        if record is not None:
+            return (record.speaker, key, hash(normalize_message(record.body)))
+        return (None, key, hash(normalize_message(line)))
+
+    def should_alert(self, key, line: str, record=None) -> bool:
+        """True the first time a speaker posts a message matching a filter, then False for
+        every repost of it until the window has passed."""
+        window = self.configs.repost_cooldown_seconds
+        if not window or window <= 0:
+            return True
+        now = self.clock.now()
+        self._expire(now - window)
+
+        cooldown_key = self.key_for(key, line, record)
+        entry = self._entries.get(cooldown_key)
+        if entry is not None:
+            entry[1] += 1
+            entry_filter = self.configs.search_strings.get(key)
+            metrics.counter("reposts_suppressed", filter=entry_filter.name if entry_filter else key).inc()
+            return False
+
+        self._entries[cooldown_key] = [now, 0]
+        while len(self._entries) > max(self.configs.repost_cooldown_max_entries, 1):
+            self._entries.popitem(last=False)
+        return True
+
+    def repeats(self, key, line: str, record=None) -> int:
+        """How many times a match has been suppressed since it was last alerted on."""
+        entry = self._entries.get(self.key_for(key, line, record))
+        return entry[1] if entry else 0
+
+    def _expire(self, cutoff: float) -> None:
+        while self._entries:
+            alerted_at = next(iter(self._entries.values()))[0]
+            if alerted_at > cutoff:
+                break
+            self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        self._entries.clear()
@@ -1,11 +1,13 @@
 import tkinter as tk
 import ttkbootstrap as ttk
-import time
+
+from thalassa_core.clock import MonotonicClock
 
 class Rumble(ttk.Frame):
-    def __init__(self, rumble_frame, configs):
+    def __init__(self, rumble_frame, configs, clock=None):
         super().__init__(rumble_frame)
         
+        self.clock = clock or MonotonicClock()
         self.rumble_frame = rumble_frame
 
         self.configs = configs
@@ -38,12 +40,12 @@ class Rumble(ttk.Frame):
 
 
     def set_start_time(self):
-        self.start_time = time.monotonic()
+        self.start_time = self.clock.now()
         self.set_rumble_active(True)
         self._update_display()
 
     def _calc_minutes_passed(self):
-        time_passed = time.monotonic() - self.start_time
+        time_passed = self.clock.now() - self.start_time
         minutes_passed = int(time_passed // 60)
         minutes_passed = min(minutes_passed, 15)
         return minutes_passed
@@ -97,7 +99,7 @@ class Rumble(ttk.Frame):
         else: 
             self._draw_rumble_table()
 
-        self.after(60000, self._update_display) # Only updates the display every minute
+        self.clock.call_later(self, 60000, self._update_display) # Only updates the display every minute
 
     
     def set_rumble_active(self, active: bool):
@@ -0,0 +1,96 @@
+from pathlib import Path
+import time
+
+import pygame.mixer as mixer
+
+from thalassa_core.metrics import metrics
+
+SOUNDS_DIR = Path(__file__).resolve().parent.parent / "media" / "sounds"
+
+# Samples per mixer buffer. pygame's default of 4096 adds close to 100 ms before a sound is heard.
+MIXER_BUFFER = 512
+
+
+class SoundService():
+    """Every alert sound, decoded once into a mixer.Sound and kept in memory, so playing one
+    is just handing a buffer to a free mixer channel, with no disk access or decoding.
+
+    The configured sounds (each filter's, rumble_warning_sound and swabbie_warning_sound) are
+    loaded when the service starts, and refresh() is called by the settings screens whenever one
+    of them changes, so an alert never waits on decoding. Anything else asked for is loaded the
+    first time it is played."""
+    def __init__(self, sounds_dir: Path = SOUNDS_DIR, buffer: int = MIXER_BUFFER) -> None:
+        self.sounds_dir = sounds_dir
+        self.buffer = buffer
+        self.configs = None
+        self._sounds: dict[str, mixer.Sound | None] = {}  # None for sounds that failed to load, so they aren't retried every alert
+        self._loaded_for = None
+
+    def start(self, configs=None) -> None:
+        """Opens the mixer if it isn't already and loads the configured sounds. Safe to call more than once."""
+        if configs is not None:
+            self.configs = configs
+        if not mixer.get_init():
+            mixer.pre_init(frequency=44100, size=-16, channels=2, buffer=self.buffer)
+            mixer.init()
+        self.refresh()
+
+    def configured_sounds(self) -> set[str]:
+        configs = self.configs
+        names = {entry.sound for entry in configs.search_strings.values() if entry.sound}
+        names.update(name for name in (configs.rumble_warning_sound, configs.swabbie_warning_sound) if name)
+        return names
+
+    def refresh(self) -> None:
+        """Loads any newly configured sounds and drops the ones no longer used, if the settings have changed.
+        Called as a setting is typed, so names with no file yet are left for play() to complain about."""
+        if self.configs is None:
+            return
+        configs = self.configs
+        loaded_for = (configs.filters_revision, configs.rumble_warning_sound, configs.swabbie_warning_sound)
+        if loaded_for == self._loaded_for:
+            return
+        self._loaded_for = loaded_for
+
+        names = self.configured_sounds()
+        for name in list(self._sounds):
+            if name not in names:
+                del self._sounds[name]
+        for name in names:
+            if self._sounds.get(name) is None and (self.sounds_dir / name).is_file():
+                self._sounds[name] = self._load(name)
+
+    def _load(self, name: str) -> mixer.Sound | None:
+        sound_path = self.sounds_dir / name
+        if not sound_path.exists():
+            print(F"Sound file not found: {sound_path}")
+            return None
+        try:
+            with metrics.histogram("sound_load").time():
+                return mixer.Sound(str(sound_path))
+        except Exception as e:
+            print(F"Failed to load sound {name}: {e}")
+            return None
+
+    def play(self, name: str, source: str) -> bool:
+        """Plays a sound now, over anything already playing. Returns False if it couldn't be played.
+        The time from being asked to the sound starting goes to the sound_start histogram."""
+        start = time.perf_counter_ns()
+        try:
+            if not mixer.get_init():
+                self.start()
+            if name not in self._sounds:
+                self._sounds[name] = self._load(name)
+            sound = self._sounds[name]
+            if sound is None:
+                return False
+            sound.play()
+        except Exception as e:
+            print(F"Warning sound failed to play! {e}")
+            return False
+        metrics.histogram("sound_start", source=source).record_since(start)
+        metrics.counter("sounds_played", source=source).inc()
+        return True
+
+
+sounds = SoundService()
@@ -0,0 +1,205 @@
+from collections import deque
+from pathlib import Path
+import gzip
+import itertools
+
+from thalassa_core.configs import Configs
+from thalassa_core.log_parser import LogParser
+from thalassa_core.log_reader import IncrementalReader
+from thalassa_core.file_registry import FileRegistry
+from thalassa_core.file_watcher import create_watcher
+
+# Passed along a followed stream whenever a poll turns up nothing new, so stages like batch can
+# hand over what they have instead of waiting for more. Never reaches the consumer.
+_IDLE = object()
+
+
+def _plain_name(name: str) -> str:
+    return name[:-3] if name.lower().endswith(".gz") else name
+
+
+class Stream():
+    """An iterable of events with chainable stages, each one lazy so memory use doesn't grow with the input.
+
+        for batch in iter_events([chatlog_dir]).of_type(FilterMatchEvent).batch(50):
+            ..."""
+    def __init__(self, iterable) -> None:
+        self._iterable = iterable
+
+    def __iter__(self):
+        return (item for item in self._iterable if item is not _IDLE)
+
+    def _stage(self, generator) -> "Stream":
+        return Stream(generator)
+
+    def filter(self, predicate) -> "Stream":
+        return self._stage(item for item in self._iterable if item is _IDLE or predicate(item))
+
+    def of_type(self, *types) -> "Stream":
+        return self._stage(item for item in self._iterable if item is _IDLE or isinstance(item, types))
+
+    def map(self, function) -> "Stream":
+        return self._stage(item if item is _IDLE else function(item) for item in self._iterable)
+
+    def window(self, size: int, step: int = 1) -> "Stream":
+        """Sliding windows: tuples of the last size items, one every step items."""
+        def windows():
+            recent = deque(maxlen=size)
+            since_last = 0
+            for item in self._iterable:
+                if item is _IDLE:
+                    yield item
+                    continue
+                recent.append(item)
+                since_last += 1
+                if len(recent) == size and since_last >= step:
+                    since_last = 0
+                    yield tuple(recent)
+        return self._stage(windows())
+
+    def batch(self, size: int) -> "Stream":
+        """Lists of up to size items. A followed stream also hands over a short batch when it goes quiet."""
+        def batches():
+            pending = []
+            for item in self._iterable:
+                if item is _IDLE:
+                    if pending:
+                        yield pending
+                        pending = []
+                    yield item
+                    continue
+                pending.append(item)
+                if len(pending) >= size:
+                    yield pending
+                    pending = []
+            if pending:
+                yield pending
+        return self._stage(batches())
+
+    def take(self, count: int) -> "Stream":
+        return Stream(itertools.islice(iter(self), count))
+
+
+class _EventSource():
+    """Reads log and chatlog files through a LogParser, turning each line into the records and events it produces."""
+    def __init__(self, paths: list[Path], configs: Configs | None, from_start: bool, block_size: int) -> None:
+        if configs is None:
+            configs = Configs(checkpoint_file=None)
+            configs.chat_filter_off = False
+        self.events = []
+        self.parser = LogParser(self.events.append, configs)
+        self.parser.watcher.close() # The source does its own watching
+        self.from_start = from_start
+        self.block_size = block_size
+
+        self.files: list[Path] = []
+        self.registries: dict[Path, FileRegistry] = {}
+        for path in map(Path, paths):
+            if path.is_dir():
+                self.registries[path] = FileRegistry(path, self.accept)
+            else:
+                self.files.append(path)
+        self.readers: dict[Path, IncrementalReader] = {}
+
+    def is_log(self, path: Path) -> bool:
+        return self.parser._is_log_file(_plain_name(path.name))
+
+    def accept(self, name: str) -> bool:
+        name = _plain_name(name)
+        return self.parser._is_log_file(name) or self.parser._is_chatlog_file(name)
+
+    def lines(self, path: Path, reader: IncrementalReader | None):
+        if reader is not None:
+            return reader.iter_lines(self.block_size)
+        # A gzipped log is only ever read once, start to finish
+        return (line.rstrip("\r\n") for line in gzip.open(path, "rt", encoding="utf-8", errors="replace"))
+
+    def read(self, path: Path, reader: IncrementalReader | None):
+        if self.is_log(path) and reader is not None:
+            # Only a handful of game log lines are events, scan them a block at a time
+            for chunk in reader.iter_chunks(self.block_size):
+                self.parser.process_log_chunk(chunk)
+                yield from self.take_events()
+            return
+
+        log = self.is_log(path)
+        for line in self.lines(path, reader):
+            if log:
+                self.parser.process_log_line(line)
+            else:
+                yield self.parser.process_chat_line(line)
+            yield from self.take_events()
+
+    def take_events(self) -> list:
+        events = self.events[:]
+        self.events.clear()
+        return events
+
+    def discover(self, first: bool) -> list[Path]:
+        """Starts a reader for every file not seen before and returns them, oldest name first."""
+        found = list(self.files) if first else []
+        for directory, registry in self.registries.items():
+            entries = registry.scan()
+            if entries is None:
+                continue
+            found.extend(directory / name for name in sorted(entries))
+            for path in [path for path in self.readers if path.parent == directory and path.name not in entries]:
+                self.readers.pop(path).close()
+
+        new_files = []
+        for path in found:
+            if path in self.readers or not path.exists():
+                continue
+            if path.name.lower().endswith(".gz"):
+                if first:
+                    new_files.append(path)
+                continue
+            # Files there from the start are read from the beginning or skipped to the end, anything newer is read in full
+            offset = 0 if self.from_start or not first else path.stat().st_size
+            self.readers[path] = IncrementalReader(path, offset)
+            new_files.append(path)
+        return new_files
+
+    def close(self) -> None:
+        for reader in self.readers.values():
+            reader.close()
+        self.parser.close()
+
+
+def iter_events(paths, configs: Configs | None = None, follow: bool = True, from_start: bool = True,
+                poll_interval: float = 0.25, block_size: int = 1024 * 1024) -> Stream:
+    """Lazily yields a ChatLine for every chatlog line, followed by any FilterMatchEvents for it,
+    and a GameEvent for every yohoho log line that matches an event pattern.
+
+    paths can be files or directories, directories are searched for logs and chatlogs (.gz too,
+    read once). Without configs the default filters are used. With follow, keeps watching for
+    new lines and new files like tail -f until the stream is closed; from_start=False skips
+    what is already in the files when it starts."""
+    def generate():
+        source = _EventSource(paths, configs, from_start, block_size)
+        watcher = create_watcher() if follow else None
+        try:
+            if watcher:
+                for directory in {path.parent for path in source.files} | set(source.registries):
+                    watcher.watch(directory)
+            for path in source.discover(first=True):
+                yield from source.read(path, source.readers.get(path))
+            while watcher:
+                watcher.wait(poll_interval)
+                changes = watcher.read_changes()
+                source.discover(first=False)
+                produced = False
+                for path, reader in list(source.readers.items()):
+                    names = changes.get(path.parent, set())
+                    if names is not None and path.name not in names:
+                        continue # The watcher says this one wasn't written to
+                    for item in source.read(path, reader):
+                        produced = True
+                        yield item
+                if not produced:
+                    yield _IDLE
+        finally:
+            if watcher:
+                watcher.close()
+            source.close()
+    return Stream(generate())
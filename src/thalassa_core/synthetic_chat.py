@@ -0,0 +1,127 @@
+from pathlib import Path
+import random
+
+from thalassa_core.configs import SearchEntry
+
+# How a line from each channel is written, the channel is the third word of the line
+CHANNEL_FORMATS = {
+    "trade": '{speaker} trade chats, "{body}"',
+    "global": '{speaker} global chats, "{body}"',
+    "crew": '{speaker} crew chats, "{body}"',
+    "says,": '{speaker} says, "{body}"',
+    "tells": '{speaker} tells ye, "{body}"',
+}
+DEFAULT_CHANNEL_MIX = {"trade": 0.4, "global": 0.25, "crew": 0.2, "says,": 0.1, "tells": 0.05}
+
+BUY_WORDS = ["buying", "[b]", "wtb", "lf", "looking for"]
+SELL_WORDS = ["selling", "[s]", "wts", "free", "giving away"]
+ITEMS = [
+    "ci map", "cursed isles map", "reliq", "vamp charm", "wayfinder", "wolf charm", "ww charm",
+    "sloop", "cutter", "dhow", "longship", "baghlah", "merchant brig", "war brig", "grand frigate",
+    "fine cannons", "rum", "grog", "iron", "wood", "cloth", "sugar", "hemp", "gems", "pearls",
+    "ancient coins", "kraken blood", "foraged goods", "bludgeon", "sabre", "furnishing", "deed",
+]
+PRICES = ["10k", "25k", "50k", "100k", "250k", "1m", "ono", "pst", "for doubloons", "cheap"]
+CHATTER = [
+    "anyone up for a pillage", "ahoy", "need pirates for a blockade", "who's got the next ci",
+    "the kraken is up", "lol", "gg", "nice one", "anyone seen the admiral", "looking good today",
+    "brb", "heading to the inn", "pvp anyone", "nobody buys sloops any more", "that was close",
+]
+SYLLABLES = ["ja", "ri", "ko", "mal", "dru", "vex", "ton", "ka", "sel", "ine", "bor", "qu", "ath", "el"]
+
+
+class SyntheticChat():
+    """Writes chatlog lines that look like the real thing, always the same lines for the same seed.
+
+    channel_mix is {channel: weight}, trade_ratio is the share of trade lines that are buy/sell
+    adverts rather than chatter, and multiline_ratio is the share of messages long enough to
+    wrap onto continuation lines without a timestamp."""
+    def __init__(self, seed: int = 0, channel_mix: dict[str, float] | None = None,
+                 trade_ratio: float = 0.8, multiline_ratio: float = 0.05, speakers: int = 500) -> None:
+        self.random = random.Random(seed)
+        self.channel_mix = channel_mix or DEFAULT_CHANNEL_MIX
+        self.trade_ratio = trade_ratio
+        self.multiline_ratio = multiline_ratio
+        self.speakers = [self._name() for _ in range(speakers)]
+        self._channels = list(self.channel_mix)
+        self._weights = [self.channel_mix[channel] for channel in self._channels]
+
+    def _name(self) -> str:
+        name = "".join(self.random.choice(SYLLABLES) for _ in range(self.random.randint(2, 4)))
+        return name.capitalize()
+
+    def _advert(self) -> str:
+        parts = []
+        # Sometimes both buying and selling in the one message
+        sides = self.random.choice([(BUY_WORDS,), (SELL_WORDS,), (SELL_WORDS, BUY_WORDS), (BUY_WORDS, SELL_WORDS)])
+        for words in sides:
+            items = self.random.sample(ITEMS, self.random.randint(1, 3))
+            parts.append(F"{self.random.choice(words)} {', '.join(items)} {self.random.choice(PRICES)}")
+        message = " ".join(parts)
+        # Adverts are often shouted
+        return message.upper() if self.random.random() < 0.2 else message
+
+    def _body(self, channel: str) -> str:
+        if channel == "trade" and self.random.random() < self.trade_ratio:
+            return self._advert()
+        return " ".join(self.random.sample(CHATTER, self.random.randint(1, 2)))
+
+    def lines(self, count: int):
+        """Yields count chatlog lines, continuation lines included."""
+        produced = 0
+        seconds = self.random.randint(0, 86399)
+        while produced < count:
+            seconds = (seconds + self.random.randint(0, 3)) % 86400
+            timestamp = F"{seconds // 3600:02}:{seconds // 60 % 60:02}:{seconds % 60:02}"
+            channel = self.random.choices(self._channels, self._weights)[0]
+            body = self._body(channel)
+
+            line = F"[{timestamp}] " + CHANNEL_FORMATS[channel].format(speaker=self.random.choice(self.speakers), body=body)
+
+            continuation = []
+            if self.random.random() < self.multiline_ratio:
+                # The rest of a long message comes on its own lines, the closing quote on the last one
+                continuation = [self._body(channel) for _ in range(self.random.randint(1, 3))]
+                line = line[:-1]
+                continuation[-1] += '"'
+
+            for text in [line] + continuation:
+                if produced == count:
+                    return
+                yield text
+                produced += 1
+
+    def game_lines(self, count: int, event_patterns: list[str], event_ratio: float = 0.001):
+        """Yields yohoho log lines, event_ratio of them containing one of event_patterns."""
+        for index in range(count):
+            millis = index * 37
+            timestamp = F"2025/11/25 {millis // 3600000 % 24:02}:{millis // 60000 % 60:02}:{millis // 1000 % 60:02}:{millis % 1000:03}"
+            if event_patterns and self.random.random() < event_ratio:
+                message = F"INFO ak.doLog: {self.random.choice(event_patterns)}"
+            else:
+                message = F"INFO ak.doLog: Updating {self.random.choice(ITEMS)} {self.random.randint(0, 99999)} [x={self.random.random():.4f}]"
+            yield F"{timestamp} {message}"
+
+    def write(self, path: Path, count: int) -> None:
+        with Path(path).open("w", encoding="utf-8") as fh:
+            for line in self.lines(count):
+                fh.write(line + "\n")
+
+
+def filter_catalogue(count: int, seed: int = 0) -> dict[int, SearchEntry]:
+    """count filters like a heavy user would have: mostly trade buy/sell filters, some on
+    other channels or every channel, and a few regex ones. Keyed from 1 like the defaults."""
+    rand = random.Random(seed)
+    filters = {}
+    for key in range(1, count + 1):
+        roll = rand.random()
+        terms = " | ".join(rand.sample(ITEMS, rand.randint(1, 6)))
+        if roll < 0.1:
+            filters[key] = SearchEntry(name=F"Regex {key}", channel=rand.choice(["trade", "global", ""]),
+                                       string_or_regex="Regex", regex=rF"\b{rand.choice(ITEMS)}\b.*\d+k")
+        elif roll < 0.75:
+            filters[key] = SearchEntry(name=F"Trade {key}", channel="trade",
+                                       buy_or_sell=rand.choice(["Buy", "Sell"]), strings=terms)
+        else:
+            filters[key] = SearchEntry(name=F"Chat {key}", channel=rand.choice(["global", "crew", ""]), strings=terms)
+    return filters
@@ -1,14 +1,17 @@
 import tkinter as tk
 import ttkbootstrap as ttk
 import time
-from pathlib import Path
-import pygame.mixer as mixer
+
+from thalassa_core.clock import MonotonicClock
+from thalassa_core.sound_service import sounds
 
 class Timer(ttk.Frame):
-    def __init__(self, timer_frame: ttk.Frame, configs=None):
+    def __init__(self, timer_frame: ttk.Frame, configs=None, clock=None):
         super().__init__(timer_frame)
 
-        mixer.init()
+        self.clock = clock or MonotonicClock() # A ManualClock when replaying logs
+
+        sounds.start(configs)
 
         self.timer_frame = timer_frame
         
@@ -74,7 +77,7 @@ class Timer(ttk.Frame):
     def start(self):
         if not self.running:
             self.running = True
-            self.start_time = time.monotonic()
+            self.start_time = self.clock.now()
             self._tick()
             self.warning_played = False
 
@@ -91,7 +94,7 @@ class Timer(ttk.Frame):
         if not self.running:
             return
 
-        self.current_time = time.monotonic()
+        self.current_time = self.clock.now()
         self.time_passed = self.current_time - self.start_time
         
         # UI Updates
@@ -100,7 +103,7 @@ class Timer(ttk.Frame):
         
         # Schedule next tick (approx 50ms for responsiveness)
         if self.running:
-            self.after(50, self._tick)
+            self.clock.call_later(self, 50, self._tick)
 
     def _check_warnings(self):
         """Checks if current time breaches warning thresholds."""
@@ -132,20 +135,7 @@ class Timer(ttk.Frame):
         
 
     def _play_sound(self):
-
-        try:
-            base_dir = Path(__file__).resolve().parent.parent
-            sound_path = base_dir / "media" / "sounds" / self.warning_sound
-
-            if not sound_path.exists():
-                print(f"Sound file not found: {sound_path}")
-                return
-
-            mixer.music.load(str(sound_path))
-            mixer.music.play()
-
-        except Exception as e:
-            print(f"Warning sound failed to play! {e}")
+        sounds.play(self.warning_sound, source="timer")
 
     # --- SETTERS ---
 
@@ -0,0 +1,51 @@
+import re
+
+
+class TradeTokenizer():
+    """Splits a trade message into buy and sell segments.
+
+    A segment runs from a buy/sell keyword up to the next keyword, e.g.
+    "wtb reliq, selling ci map" has a buy segment "wtb reliq," and a sell segment "selling ci map".
+    The keyword regex is compiled once per set of keywords, and segments are returned as
+    (start, end) offsets into the message rather than as new strings."""
+    def __init__(self, buy_strings, sell_strings) -> None:
+        self.key = (tuple(buy_strings), tuple(sell_strings))
+        self.buy_set = {keyword.lower() for keyword in buy_strings}
+        self.sell_set = {keyword.lower() for keyword in sell_strings}
+
+        all_keywords = sorted(self.buy_set | self.sell_set, key=len, reverse=True)
+        if all_keywords:
+            # Match any keyword literally, case-insensitive
+            self._pattern = re.compile("|".join(re.escape(keyword) for keyword in all_keywords), re.IGNORECASE)
+        else:
+            self._pattern = None
+
+    def spans(self, message: str) -> tuple[list[tuple[int, int]], list[tuple[int, int]]]:
+        """Returns the (start, end) offsets of the buy segments and the sell segments of message.
+        Trailing whitespace is left out of each segment."""
+        if self._pattern is None:
+            return [], []
+        matches = list(self._pattern.finditer(message))
+        if not matches:
+            return [], []
+
+        buy_spans = []
+        sell_spans = []
+        last = len(matches) - 1
+        for i, match in enumerate(matches):
+            start = match.start()
+            end = matches[i + 1].start() if i < last else len(message)
+            while end > start and message[end - 1].isspace():
+                end -= 1
+            if match.group().lower() in self.buy_set:
+                buy_spans.append((start, end))
+            else:
+                sell_spans.append((start, end))
+        return buy_spans, sell_spans
+
+    def split(self, message: str) -> tuple[list[str], list[str]]:
+        """Same as spans() but returns the segments themselves."""
+        buy_spans, sell_spans = self.spans(message)
+        return ([message[start:end] for start, end in buy_spans],
+                [message[start:end] for start, end in sell_spans])
+
@@ -0,0 +1,24 @@
+import pytest
+
+from thalassa_core.configs import Configs
+from thalassa_core.log_parser import LogParser
+
+
+@pytest.fixture
+def configs():
+    """The default settings, with no checkpoint file so nothing is read from or written to src/media."""
+    return Configs(checkpoint_file=None)
+
+
+@pytest.fixture
+def events():
+    """Everything the parser fixture emits, in order."""
+    return []
+
+
+@pytest.fixture
+def parser(configs, events):
+    """A LogParser on the configs fixture. Filters set on configs before its first line are picked up."""
+    log_parser = LogParser(events.append, configs)
+    yield log_parser
+    log_parser.close()
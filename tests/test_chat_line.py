@@ -0,0 +1,42 @@
+import pytest
+
+from thalassa_core.chat_line import parse_chat_line
+
+
+@pytest.mark.parametrize("line, timestamp, speaker, channel, body", [
+    ('[19:20:11] Jice trade chats, "selling ci map"', "19:20:11", "Jice", "trade", "selling ci map"),
+    ('[19:20:11] Jice global chats, "hello, anyone?"', "19:20:11", "Jice", "global", "hello, anyone?"),
+    ('[19:20:11] Jice crew chats, "sail ho"', "19:20:11", "Jice", "crew", "sail ho"),
+    ('[19:20:11] Jice says, "a, b, c"', "19:20:11", "Jice", "says,", "a, b, c"),
+    ('[19:20:11] Jice tells ye, "psst, ci map?"', "19:20:11", "Jice", "tells", "psst, ci map?"),
+    ('[19:20:11] Jice trade chats, "selling ci map, cursed isles map"', "19:20:11", "Jice", "trade", "selling ci map, cursed isles map"),
+    ('[19:20:11] Jice trade chats, ""', "19:20:11", "Jice", "trade", ""),
+    ('[19:20:11] Jice trade chats, "unterminated', "19:20:11", "Jice", "trade", '"unterminated'),
+    ("[19:20:11] Jice has boarded the vessel", "19:20:11", "Jice", "has", "has boarded the vessel"),
+])
+def test_chat_lines(line, timestamp, speaker, channel, body):
+    record = parse_chat_line(line)
+    assert (record.timestamp, record.speaker, record.channel, record.body) == (timestamp, speaker, channel, body)
+    assert not record.continuation
+    assert record.line == line
+    assert record.lower == line.lower()
+    assert record.body_lower == body.lower()
+    # body_start turns offsets in the body into offsets in the line
+    assert line[record.body_start:record.body_start + len(body)] == body
+
+
+@pytest.mark.parametrize("line", [
+    "and the rest of a long message",
+    "ci map, selling",
+    "",
+])
+def test_continuation_lines(line):
+    record = parse_chat_line(line)
+    assert record.continuation
+    assert record.timestamp is None and record.speaker is None
+    assert record.body == line and record.body_start == 0
+
+
+def test_channel_is_the_third_word_lowercased():
+    assert parse_chat_line('[19:20:11] Jice TRADE chats, "hi"').channel == "trade"
+    assert parse_chat_line("[19:20:11] Jice").channel is None
@@ -0,0 +1,174 @@
+import json
+import os
+
+from thalassa_core.checkpoints import OffsetCheckpoints, file_key
+from thalassa_core.configs import Configs
+from thalassa_core.file_watcher import PollingWatcher
+from thalassa_core.log_parser import LogParser
+
+LOG_NAME = "yohoho_1764097495517.log"
+EVENT = "2025/11/25 19:20:11:789 INFO ak.doLog: Stopping foraging in 119 seconds"
+
+
+def event_lines(count: int, first: int = 0) -> str:
+    return "".join(F"{EVENT} #{number}\n" for number in range(first, first + count))
+
+
+class Session():
+    """A LogParser tailing log_dir with its checkpoints in checkpoint_file, like one run of the app."""
+    def __init__(self, log_dir, checkpoint_file, polling: bool = False) -> None:
+        self.events = []
+        self.parser = LogParser(self.events.append, Configs(checkpoint_file=checkpoint_file))
+        if polling:
+            self.parser.watcher.close()
+            self.parser.watcher = PollingWatcher()
+        self.parser.update_log_path(log_dir)
+        self.parser.update_all_logs()
+
+    def read(self) -> list[str]:
+        self.parser.update_logs()
+        lines = [event.line for event in self.events]
+        self.events.clear()
+        return lines
+
+    def close(self) -> None:
+        self.parser.close()
+
+
+def test_resume_after_restart(tmp_path):
+    log = tmp_path / LOG_NAME
+    checkpoint_file = tmp_path / "offsets.json"
+    log.write_text(event_lines(2))
+
+    session = Session(tmp_path, checkpoint_file)
+    assert session.read() == [] # Lines from before the first run are skipped
+    with log.open("a") as fh:
+        fh.write(event_lines(2, 2))
+    assert len(session.read()) == 2
+    session.close()
+
+    with log.open("a") as fh:
+        fh.write(event_lines(3, 4)) # Written while closed
+    session = Session(tmp_path, checkpoint_file)
+    assert session.read() == event_lines(3, 4).splitlines()
+    session.close()
+
+
+def test_file_never_read_still_gets_a_checkpoint(tmp_path):
+    log = tmp_path / LOG_NAME
+    checkpoint_file = tmp_path / "offsets.json"
+    log.write_text(event_lines(2))
+    two_hours_ago = log.stat().st_mtime - 7200
+    os.utime(log, (two_hours_ago, two_hours_ago))
+    (tmp_path / "yohoho_1764097495999.log").write_text("") # The game's current log, so the old one stays cold and is never read
+
+    session = Session(tmp_path, checkpoint_file)
+    assert session.read() == []
+    session.close()
+
+    with log.open("a") as fh:
+        fh.write(event_lines(1, 2)) # Written while closed
+    session = Session(tmp_path, checkpoint_file)
+    assert session.read() == event_lines(1, 2).splitlines()
+    session.close()
+
+
+def test_replaced_file_is_read_from_the_start(tmp_path):
+    log = tmp_path / LOG_NAME
+    checkpoint_file = tmp_path / "offsets.json"
+    log.write_text(event_lines(5))
+    session = Session(tmp_path, checkpoint_file)
+    session.read()
+    session.close()
+
+    # Same name, new inode. The new file is made before the old one goes so the inode can't be reused.
+    replacement = tmp_path / "replacement.tmp"
+    replacement.write_text(event_lines(1, 100))
+    os.replace(replacement, log)
+    session = Session(tmp_path, checkpoint_file)
+    assert session.read() == event_lines(1, 100).splitlines()
+    session.close()
+
+
+def test_truncated_file_is_read_from_the_start(tmp_path):
+    log = tmp_path / LOG_NAME
+    checkpoint_file = tmp_path / "offsets.json"
+    log.write_text(event_lines(5))
+    session = Session(tmp_path, checkpoint_file)
+    session.read()
+    session.close()
+
+    with log.open("w") as fh: # Same inode, shorter than the saved offset
+        fh.write(event_lines(1, 200))
+    session = Session(tmp_path, checkpoint_file)
+    assert session.read() == event_lines(1, 200).splitlines()
+    session.close()
+
+
+def test_truncation_in_place_is_noticed_when_polling(tmp_path):
+    log = tmp_path / LOG_NAME
+    log.write_text("")
+    os.utime(tmp_path, (1_700_000_000, 1_700_000_000)) # Settled, so the directory is only listed once
+    session = Session(tmp_path, None, polling=True)
+    with log.open("a") as fh:
+        fh.write(event_lines(5))
+    assert len(session.read()) == 5
+
+    with log.open("r+") as fh: # Same inode, the directory's mtime doesn't change
+        fh.truncate(0)
+    os.utime(tmp_path, (1_700_000_000, 1_700_000_000))
+    assert session.read() == []
+    with log.open("a") as fh:
+        fh.write(event_lines(1, 300))
+    assert session.read() == event_lines(1, 300).splitlines()
+    session.close()
+
+
+def test_corrupt_json_starts_empty(tmp_path, capsys):
+    checkpoint_file = tmp_path / "offsets.json"
+    checkpoint_file.write_text('{"1:2": {"name": "yohoho_1.log", "off')
+    checkpoints = OffsetCheckpoints(checkpoint_file)
+    assert checkpoints.entries == {}
+    assert "Failed to load log checkpoints" in capsys.readouterr().out
+
+    checkpoints.set("1:2", "yohoho_1.log", 10)
+    checkpoints.save()
+    assert json.loads(checkpoint_file.read_text()) == {"1:2": {"name": "yohoho_1.log", "offset": 10}}
+    assert not (tmp_path / "offsets.json.tmp").exists()
+
+
+def test_reused_inode_does_not_resume_another_files_offset(tmp_path):
+    log_dir = tmp_path / "logs"
+    log_dir.mkdir()
+    session = Session(log_dir, tmp_path / "offsets.json")
+    session.read()
+
+    # A new log that got the inode of an old, deleted one
+    log = log_dir / LOG_NAME
+    log.write_text(event_lines(3))
+    key = file_key(log.stat())
+    session.parser.checkpoints.entries[key] = {"name": "yohoho_1700000000000.log", "offset": len(EVENT) + 4}
+    assert session.parser.checkpoints.get(key, LOG_NAME, log.stat().st_size) is None
+    assert session.read() == event_lines(3).splitlines()
+    session.close()
+
+
+def test_offset_past_the_end_is_not_used(tmp_path):
+    checkpoints = OffsetCheckpoints(None)
+    checkpoints.set("1:2", "yohoho_1.log", 100)
+    assert checkpoints.get("1:2", "yohoho_1.log", 100) == 100
+    assert checkpoints.get("1:2", "yohoho_1.log", 99) is None
+    assert checkpoints.get("1:2", "yohoho_2.log", 100) is None
+
+
+def test_checkpoints_of_missing_files_are_pruned(tmp_path):
+    log = tmp_path / LOG_NAME
+    checkpoint_file = tmp_path / "offsets.json"
+    log.write_text(event_lines(1))
+    checkpoint_file.write_text(json.dumps({"1:2": {"name": "yohoho_1600000000000.log", "offset": 10}}))
+
+    session = Session(tmp_path, checkpoint_file)
+    session.read()
+    session.close()
+    saved = json.loads(checkpoint_file.read_text())
+    assert list(saved.values()) == [{"name": LOG_NAME, "offset": log.stat().st_size}]
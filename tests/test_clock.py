@@ -0,0 +1,95 @@
+import io
+import json
+
+import pytest
+
+from thalassa_core.ci_replay import TimestampParser
+from thalassa_core.clock import ManualClock
+
+
+def test_callbacks_run_in_due_order_at_their_due_time():
+    clock = ManualClock(100.0)
+    ran = []
+    clock.call_later(None, 3000, lambda: ran.append(("c", clock.now())))
+    clock.call_later(None, 1000, lambda: ran.append(("a", clock.now())))
+    clock.call_later(None, 1000, lambda: ran.append(("b", clock.now()))) # Same time, after a
+    assert clock.next_due() == 101.0
+
+    clock.advance_to(102.0)
+    assert ran == [("a", 101.0), ("b", 101.0)]
+    assert clock.now() == 102.0
+    clock.advance_to(110.0)
+    assert ran[2:] == [("c", 103.0)]
+    assert clock.next_due() is None
+
+
+def test_callback_scheduled_by_a_callback_runs_on_the_same_advance():
+    clock = ManualClock()
+    ticks = []
+    def tick():
+        ticks.append(clock.now())
+        if len(ticks) < 3:
+            clock.call_later(None, 50, tick)
+    clock.call_later(None, 50, tick)
+    clock.advance_to(1.0)
+    assert ticks == pytest.approx([0.05, 0.1, 0.15])
+
+
+def test_time_never_goes_backwards():
+    clock = ManualClock(5.0)
+    clock.advance_to(1.0)
+    assert clock.now() == 5.0
+
+
+def test_timestamp_parser():
+    timestamps = TimestampParser()
+    first = timestamps.parse("2025/11/25 19:20:11:789 INFO ak.doLog: Something")
+    assert timestamps.parse("2025/11/25 19:20:11:900 INFO ak.doLog: Something else") == pytest.approx(first + 0.111)
+    assert timestamps.parse("2025/11/25 19:20:12:000 INFO ak.doLog: Next second") == pytest.approx(first + 0.211)
+    assert timestamps.parse("\tat com.threerings.Something(Something.java:12)") is None
+
+
+def log_line(second: float, message: str) -> str:
+    minutes, seconds = divmod(second, 60)
+    return F"2025/11/25 19:{20 + int(minutes):02}:{int(seconds):02}:{round(seconds % 1 * 1000):03} INFO ak.doLog: {message}\n"
+
+
+CI_LOG = (
+    log_line(0, "Setting place view com.threerings.yohoho.sea.seamonster.cursed.client.GauntletScenePanel")
+    + log_line(10.5, "Stopping foraging in 119 seconds")
+    + log_line(200, "Disabling skirmish environment mod [mod=dark_seas]")
+)
+
+
+def replay(log_dir, configs) -> list[dict]:
+    from thalassa_core.ci_replay import CIReplay
+    configs.rumble_play_warning_sound = False
+    configs.play_swabbie_warning_sound = False
+    output = io.StringIO()
+    try:
+        replayer = CIReplay(configs, output)
+    except Exception as error: # Tk can't start without a display
+        pytest.skip(F"Tk unavailable: {error}")
+    try:
+        replayer.replay([log_dir])
+    finally:
+        replayer.close()
+    return [json.loads(line) for line in output.getvalue().splitlines()]
+
+
+def test_ci_replay_follows_the_log_timestamps(tmp_path, configs):
+    pytest.importorskip("ttkbootstrap")
+    pytest.importorskip("pygame")
+    (tmp_path / "yohoho_1764097495517.log").write_text(CI_LOG)
+
+    records = replay(tmp_path, configs)
+    start = records[0]["time"]
+    phases = []
+    for record in records:
+        phase = (record["state"]["ci_in_progress"], record["state"]["forage_active"])
+        if not phases or phases[-1][1:] != phase:
+            phases.append((round(record["time"] - start, 3), *phase))
+    # The forage times out 120 seconds after it started, on the log's clock
+    assert phases == [(0.0, False, False), (0.0, True, False), (10.5, True, True), (130.5, True, False), (200.0, False, False)]
+
+    assert replay(tmp_path, configs) == records # Same log, same output
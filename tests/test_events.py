@@ -0,0 +1,80 @@
+from thalassa_core.events import EventBus, FilterMatchEvent, GameEvent
+
+
+def game_event(number: int) -> GameEvent:
+    return GameEvent(F"line {number}", "pattern", "Cursed Isles")
+
+
+def test_nothing_is_delivered_until_flushed():
+    bus = EventBus()
+    batches = []
+    bus.subscribe(GameEvent, batches.append, batch=True)
+    events = [game_event(number) for number in range(5)]
+    for event in events:
+        bus.publish(event)
+    assert batches == [] and bus.pending == 5
+
+    assert bus.flush() == 5
+    assert batches == [events] # One call, in the order they were published
+    assert bus.pending == 0
+    assert bus.flush() == 0 and len(batches) == 1
+
+
+def test_subscribers_only_get_their_own_type():
+    bus = EventBus()
+    games = []
+    matches = []
+    bus.subscribe(GameEvent, games.append)
+    bus.subscribe(FilterMatchEvent, matches.append, batch=True)
+    first, second = game_event(1), game_event(2)
+    match = FilterMatchEvent("line", 1)
+    for event in (first, match, second):
+        bus(event) # A bus is also the parser's event callback
+    bus.flush()
+    assert games == [first, second]
+    assert matches == [[match]]
+
+
+def test_a_failing_subscriber_does_not_stop_the_others(capsys):
+    bus = EventBus()
+    def fails(argument):
+        raise ValueError("broken")
+    delivered = []
+    batches = []
+    bus.subscribe(GameEvent, fails, batch=True)
+    bus.subscribe(GameEvent, fails)
+    bus.subscribe(GameEvent, delivered.append)
+    bus.subscribe(GameEvent, batches.append, batch=True)
+    events = [game_event(number) for number in range(3)]
+    for event in events:
+        bus.publish(event)
+
+    assert bus.flush() == 3
+    assert delivered == events
+    assert batches == [events]
+    assert capsys.readouterr().out.count("Failed to deliver events") == 4 # The batch once, then each event
+
+
+def test_events_published_while_delivering_wait_for_the_next_flush():
+    bus = EventBus()
+    received = []
+    def republish(event):
+        received.append(event)
+        if event.line == "line 1":
+            bus.publish(game_event(2))
+    bus.subscribe(GameEvent, republish)
+    bus.publish(game_event(1))
+    assert bus.flush() == 1
+    assert [event.line for event in received] == ["line 1"]
+    assert bus.flush() == 1
+    assert [event.line for event in received] == ["line 1", "line 2"]
+
+
+def test_unsubscribe():
+    bus = EventBus()
+    received = []
+    bus.subscribe(GameEvent, received.append)
+    bus.unsubscribe(GameEvent, received.append)
+    bus.publish(game_event(1))
+    bus.flush()
+    assert received == []
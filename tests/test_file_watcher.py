@@ -0,0 +1,51 @@
+import os
+import shutil
+import sys
+
+import pytest
+
+from thalassa_core.file_watcher import InotifyWatcher
+
+pytestmark = pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify is Linux only")
+
+
+@pytest.fixture
+def watcher():
+    watcher = InotifyWatcher()
+    yield watcher
+    watcher.close()
+
+
+def test_directory_created_after_watch(tmp_path, watcher):
+    directory = tmp_path / "chatlogs"
+    watcher.watch(directory)
+    assert watcher.read_changes() == {directory: None}
+    assert watcher.read_changes() == {directory: None} # Polled while it doesn't exist
+
+    directory.mkdir()
+    assert watcher.read_changes() == {directory: None}
+    (directory / "Jice_emerald_chat_log.txt").write_text("hi\n")
+    assert watcher.read_changes() == {directory: {"Jice_emerald_chat_log.txt"}}
+
+
+@pytest.mark.parametrize("remove", [shutil.rmtree, lambda path: os.rename(path, path.with_name("moved"))])
+def test_directory_deleted_or_moved_and_recreated(tmp_path, watcher, remove):
+    directory = tmp_path / "logs"
+    directory.mkdir()
+    watcher.watch(directory)
+    watcher.read_changes()
+
+    remove(directory)
+    assert watcher.read_changes() == {directory: None}
+    directory.mkdir()
+    assert watcher.read_changes() == {directory: None}
+    (directory / "yohoho_1764097495517.log").write_text("line\n")
+    assert watcher.read_changes() == {directory: {"yohoho_1764097495517.log"}}
+    assert watcher.read_changes() == {}
+
+
+def test_unwatch_stops_polling(tmp_path, watcher):
+    directory = tmp_path / "missing"
+    watcher.watch(directory)
+    watcher.unwatch(directory)
+    assert watcher.read_changes() == {}
@@ -0,0 +1,56 @@
+from thalassa_core.configs import SearchEntry
+
+
+def run_filters(parser, search_strings: dict, line: str) -> None:
+    parser.configs.search_strings = search_strings
+    parser.apply_custom_chatlog_filters(line)
+
+
+def test_one_event_per_filter_with_every_span(parser, events):
+    line = '[19:20:11] Jice global chats, "ci map? anyone got a CI MAP or a vamp charm"'
+    run_filters(parser, {1: SearchEntry(name="Maps", channel="global", strings="vamp charm|ci map")}, line)
+    assert len(events) == 1
+    event = events[0]
+    assert event.matches == ["vamp charm", "ci map"] # In the order the filter lists them
+    assert [line[start:end].lower() for start, end in event.spans] == ["vamp charm", "ci map", "ci map"]
+    assert event.match == "vamp charm" and event.span == event.spans[0]
+
+
+def test_channel_less_filter_on_a_trade_line(parser, events):
+    line = '[19:20:11] Jice trade chats, "selling vamp charm"'
+    run_filters(parser, {1: SearchEntry(name="Charms", channel="", strings="vamp charm")}, line)
+    assert [(event.matches, [line[start:end] for start, end in event.spans]) for event in events] == [(["vamp charm"], ["vamp charm"])]
+
+
+def test_regex_filter_match_and_span(parser, events):
+    line = '[19:20:11] Jice crew chats, "CI    map"'
+    run_filters(parser, {1: SearchEntry(name="Regex", channel="crew", string_or_regex="Regex", regex=r"ci\s+map")}, line)
+    assert [(event.key, event.matches) for event in events] == [(1, ["ci    map"])]
+    assert [line[start:end] for start, end in events[0].spans] == ["CI    map"]
+
+
+class _LookupRecorder(dict):
+    def __getitem__(self, key):
+        self.looked_up.append(key)
+        return super().__getitem__(key)
+
+
+class _NotIterable(list):
+    def __iter__(self):
+        raise AssertionError("every filter in the bucket was visited")
+
+
+def test_filters_without_a_hit_are_never_evaluated(configs, parser, events):
+    configs.search_strings = {key: SearchEntry(name=F"Filter {key}", channel="trade", strings=F"item {key}") for key in range(50)}
+    configs.search_strings[50] = SearchEntry(name="Maps", channel="global", strings="ci map")
+    for channel in ("trade", "global"):
+        bucket = parser.get_filter_plan().bucket_for(channel)
+        bucket.by_key = _LookupRecorder(bucket.by_key)
+        bucket.by_key.looked_up = []
+        bucket.filters = _NotIterable(bucket.filters)
+
+    parser.apply_custom_chatlog_filters('[19:20:11] Jice trade chats, "selling item 7"')
+    parser.apply_custom_chatlog_filters('[19:20:11] Jice global chats, "ci map?"')
+    assert [event.key for event in events] == [7, 50]
+    assert parser.get_filter_plan().bucket_for("trade").by_key.looked_up == [7, 7]
+    assert parser.get_filter_plan().bucket_for("global").by_key.looked_up == [50]
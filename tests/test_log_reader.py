@@ -0,0 +1,106 @@
+import random
+
+import pytest
+
+from thalassa_core.log_reader import IncrementalReader
+
+LINES = [
+    '[19:20:11] Jice trade chats, "selling ci map"',
+    '[19:20:12] Bøb says, "ça va? 🗺 карта"',
+    "",
+    "2025/11/25 19:20:11:789 INFO ak.doLog: Stopping foraging in 119 seconds",
+    "ünïcödé everywhere ß",
+]
+
+
+def write_in_pieces(path, data: bytes, rng, reader) -> list[str]:
+    """Appends data a random number of bytes at a time, reading after every write like a tick would."""
+    lines = []
+    position = 0
+    with path.open("ab") as fh:
+        while position < len(data):
+            step = rng.randint(1, 7)
+            fh.write(data[position:position + step])
+            fh.flush()
+            position += step
+            lines.extend(reader.read_lines())
+    return lines
+
+
+@pytest.mark.parametrize("seed", range(25))
+def test_lines_come_out_once_whatever_the_write_splits(tmp_path, seed):
+    path = tmp_path / "chat.txt"
+    path.touch()
+    data = "".join(line + "\n" for line in LINES).encode("utf-8")
+    reader = IncrementalReader(path)
+
+    assert write_in_pieces(path, data, random.Random(seed), reader) == LINES
+    assert reader.offset == len(data)
+    assert reader.read_lines() == []
+    reader.close()
+
+
+def test_partial_line_waits_for_its_newline(tmp_path):
+    path = tmp_path / "chat.txt"
+    path.write_bytes(b"first\nsec")
+    reader = IncrementalReader(path)
+    assert reader.read_lines() == ["first"]
+    assert reader.offset == 6
+
+    with path.open("ab") as fh:
+        fh.write(b"ond\n")
+    assert reader.read_lines() == ["second"]
+    assert reader.offset == 13
+    reader.close()
+
+
+def test_multibyte_character_split_across_writes(tmp_path):
+    path = tmp_path / "chat.txt"
+    encoded = "карта\n".encode("utf-8")
+    path.write_bytes(encoded[:3]) # Ends half way through a character
+    reader = IncrementalReader(path)
+    assert reader.read_lines() == []
+
+    with path.open("ab") as fh:
+        fh.write(encoded[3:])
+    assert reader.read_lines() == ["карта"]
+    assert reader.offset == len(encoded)
+    reader.close()
+
+
+def test_read_chunk_with_max_bytes_never_splits_a_line(tmp_path):
+    path = tmp_path / "chat.txt"
+    data = "".join(line + "\n" for line in LINES).encode("utf-8")
+    path.write_bytes(data)
+    reader = IncrementalReader(path)
+    assert list(reader.iter_lines(block_size=5)) == LINES
+    assert reader.offset == len(data)
+    reader.close()
+
+
+def test_resumes_from_offset_after_close(tmp_path):
+    path = tmp_path / "chat.txt"
+    path.write_bytes(b"one\ntw")
+    reader = IncrementalReader(path)
+    assert reader.read_lines() == ["one"]
+    reader.close() # The carried "tw" is dropped and read again from the offset
+
+    with path.open("ab") as fh:
+        fh.write(b"o\nthree\n")
+    assert reader.read_lines() == ["two", "three"]
+    assert reader.offset == len(b"one\ntwo\nthree\n")
+    reader.close()
+
+
+def test_reset_after_truncation(tmp_path):
+    path = tmp_path / "chat.txt"
+    path.write_bytes(b"old line\nanother old line\n")
+    reader = IncrementalReader(path)
+    assert reader.read_lines() == ["old line", "another old line"]
+
+    path.write_bytes(b"new\n") # Truncated and rewritten
+    reader.reset(0)
+    assert reader.offset == 0
+    assert reader.read_lines() == ["new"]
+    assert reader.offset == 4
+    reader.close()
@@ -0,0 +1,50 @@
+from thalassa_core.configs import SearchEntry
+from thalassa_core.lru_memo import LRUMemo
+
+
+def test_least_recently_used_is_evicted_first():
+    memo = LRUMemo("test_eviction", 2)
+    memo.put("a", 1)
+    memo.put("b", 2)
+    assert memo.get("a") == 1 # a is now the most recently used
+    memo.put("c", 3)
+    assert memo.get("b") is None
+    assert memo.get("a") == 1
+    assert memo.get("c") == 3
+    assert len(memo) == 2
+
+
+def test_stats():
+    memo = LRUMemo("test_stats", 10)
+    memo.put("a", 1)
+    memo.get("a")
+    memo.get("a")
+    memo.get("missing")
+    stats = memo.stats()
+    assert (stats["hits"], stats["misses"], stats["size"]) == (2, 1, 1)
+    assert stats["hit_rate"] == 2 / 3
+
+
+def test_size_of_zero_stores_nothing():
+    memo = LRUMemo("test_disabled", 0)
+    memo.put("a", 1)
+    assert memo.get("a") is None
+    assert len(memo) == 0
+
+
+def test_trade_memo_is_cleared_when_the_filters_change(configs, parser, events):
+    configs.search_strings = {1: SearchEntry(name="Buying CI Map", channel="trade", buy_or_sell="Buy", strings="ci map")}
+    line = '[19:20:11] Jice trade chats, "selling ci map, reliq"'
+
+    parser.apply_custom_chatlog_filters(line)
+    parser.apply_custom_chatlog_filters(line)
+    assert [event.matches for event in events] == [["ci map"], ["ci map"]]
+    assert parser.trade_memo.hits == 1
+
+    # The cached result for the same body would be stale once the filter changes
+    configs.search_strings[1].strings = "reliq"
+    configs.bump_filters_revision()
+    events.clear()
+    parser.apply_custom_chatlog_filters(line)
+    assert [event.matches for event in events] == [["reliq"]]
+    assert parser.trade_memo.hits == 1
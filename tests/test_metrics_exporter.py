@@ -0,0 +1,60 @@
+from urllib.error import HTTPError
+from urllib.request import urlopen
+
+import pytest
+
+from thalassa_core.metrics import MetricsRegistry
+from thalassa_core.metrics_exporter import CONTENT_TYPE, MetricsExporter, format_prometheus
+
+
+@pytest.fixture
+def registry():
+    registry = MetricsRegistry()
+    registry.counter("events", type="GameEvent").inc(3)
+    registry.gauge("files", lambda: 2, state="hot")
+    histogram = registry.histogram("emit")
+    for value in (40_000, 50_000, 100_000, 3_000_000):
+        histogram.record(value)
+    return registry
+
+
+def sample(text: str, name: str) -> str:
+    return next(line.rsplit(" ", 1)[1] for line in text.splitlines() if line.startswith(name + " "))
+
+
+def test_format_prometheus(registry):
+    text = format_prometheus(registry)
+    assert "# TYPE thalassa_events_total counter" in text
+    assert sample(text, 'thalassa_events_total{type="GameEvent"}') == "3"
+    assert sample(text, 'thalassa_files{state="hot"}') == "2"
+    assert "# TYPE thalassa_emit_seconds histogram" in text
+    # le is "less than or equal", values exactly on a bound count towards it
+    assert sample(text, 'thalassa_emit_seconds_bucket{le="5e-05"}') == "2"
+    assert sample(text, 'thalassa_emit_seconds_bucket{le="0.0001"}') == "3"
+    assert sample(text, 'thalassa_emit_seconds_bucket{le="0.0025"}') == "3"
+    assert sample(text, 'thalassa_emit_seconds_bucket{le="+Inf"}') == "4"
+    assert sample(text, "thalassa_emit_seconds_count") == "4"
+    assert float(sample(text, "thalassa_emit_seconds_sum")) == pytest.approx(0.00319)
+
+
+def test_clashing_names_are_left_out(registry, capsys):
+    registry.gauge("events_total", lambda: 1)
+    text = format_prometheus(registry)
+    assert text.count("# TYPE thalassa_events_total ") == 1
+    assert "clashes with" in capsys.readouterr().out
+
+
+def test_scrape_over_http(registry):
+    exporter = MetricsExporter(port=0, registry=registry)
+    assert exporter.start()
+    try:
+        with urlopen(F"http://127.0.0.1:{exporter.port}/metrics", timeout=5) as response:
+            assert response.status == 200
+            assert response.headers["Content-Type"] == CONTENT_TYPE
+            body = response.read().decode("utf-8")
+        assert body == format_prometheus(registry)
+        with pytest.raises(HTTPError) as error:
+            urlopen(F"http://127.0.0.1:{exporter.port}/nothing", timeout=5)
+        assert error.value.code == 404
+    finally:
+        exporter.stop()
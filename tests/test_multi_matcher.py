@@ -0,0 +1,74 @@
+import random
+
+import pytest
+
+from thalassa_core.multi_matcher import MultiPatternMatcher
+
+
+def naive_find_all(patterns: dict, text: str) -> list:
+    """Every occurrence of every pattern with str.find, the way the filters used to search."""
+    matches = []
+    for pattern, payloads in patterns.items():
+        start = text.find(pattern)
+        while start != -1:
+            for payload in payloads:
+                matches.append((start, start + len(pattern), payload))
+            start = text.find(pattern, start + 1)
+    return sorted(matches, key=repr)
+
+
+def test_overlapping_terms():
+    matcher = MultiPatternMatcher([("ci map", 1), ("map s", 2), ("aaa", 3)])
+    assert sorted(matcher.find_all("ci map sale")) == [(0, 6, 1), (3, 8, 2)]
+    # A term overlapping itself is found at every position
+    assert matcher.find_all("aaaa") == [(0, 3, 3), (1, 4, 3)]
+
+
+def test_terms_that_are_suffixes_of_other_terms():
+    matcher = MultiPatternMatcher([("cursed isles map", "long"), ("isles map", "mid"), ("map", "short")])
+    assert sorted(matcher.find_all("selling cursed isles map")) == [
+        (8, 24, "long"),
+        (15, 24, "mid"),
+        (21, 24, "short"),
+    ]
+
+
+def test_empty_and_duplicate_terms():
+    matcher = MultiPatternMatcher([("", 1), ("map", 1), ("map", 1), ("map", 2)])
+    assert matcher.patterns == ["map"]
+    assert matcher.find_all("map") == [(0, 3, 1), (0, 3, 2)]
+    assert matcher.matched_payloads("map map") == [1, 2]
+
+
+def test_no_patterns_matches_nothing():
+    matcher = MultiPatternMatcher()
+    assert matcher.find_all("anything") == []
+    assert list(matcher.matching_lines("a\nb\n")) == []
+
+
+def test_non_ascii_text():
+    matcher = MultiPatternMatcher([("карта", "ru"), ("ß", "de"), ("🗺", "emoji")])
+    text = "straße карта 🗺 карта"
+    assert sorted(matcher.find_all(text)) == sorted([(4, 5, "de"), (7, 12, "ru"), (13, 14, "emoji"), (15, 20, "ru")])
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_find_all_matches_str_find(seed):
+    rng = random.Random(seed)
+    alphabet = "ab c,é"
+    patterns = {}
+    for index in range(rng.randint(1, 12)):
+        pattern = "".join(rng.choice(alphabet) for _ in range(rng.randint(1, 4)))
+        patterns.setdefault(pattern, []).append(index)
+    matcher = MultiPatternMatcher((pattern, payload) for pattern, payloads in patterns.items() for payload in payloads)
+
+    for _ in range(50):
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 60)))
+        assert sorted(matcher.find_all(text), key=repr) == naive_find_all(patterns, text)
+
+
+def test_matching_lines_only_returns_lines_with_a_pattern():
+    matcher = MultiPatternMatcher([("rumble", 1), ("ci", 2)])
+    text = "nothing here\nstart rumble now\nnope\nci and rumble\nlast ci"
+    lines = [text[start:end] for start, end in matcher.matching_lines(text)]
+    assert lines == ["start rumble now", "ci and rumble", "last ci"]
@@ -0,0 +1,69 @@
+from thalassa_core.chat_line import parse_chat_line
+from thalassa_core.clock import ManualClock
+from thalassa_core.repost_cooldown import RepostCooldown, normalize_message
+
+
+def make_cooldown(configs, window: float = 60.0, max_entries: int = 100):
+    configs.repost_cooldown_seconds = window
+    configs.repost_cooldown_max_entries = max_entries
+    clock = ManualClock()
+    return RepostCooldown(configs, clock), clock
+
+
+def alert(cooldown, line: str, key=1) -> bool:
+    record = parse_chat_line(line)
+    return cooldown.should_alert(key, record.line, record)
+
+
+def test_repost_is_suppressed_until_the_window_passes(configs):
+    cooldown, clock = make_cooldown(configs, window=60)
+    assert alert(cooldown, '[19:20:11] Jice trade chats, "Selling CI map!"')
+    clock.advance_to(30)
+    assert not alert(cooldown, '[19:20:41] Jice trade chats, "selling  ci map"')
+    assert cooldown.repeats(1, "", parse_chat_line('[19:20:41] Jice trade chats, "selling ci map"')) == 1
+    clock.advance_to(59.9)
+    assert not alert(cooldown, '[19:21:10] Jice trade chats, "selling ci map"')
+    # The window runs from the last alert, reposting doesn't push it back
+    clock.advance_to(60)
+    assert alert(cooldown, '[19:21:11] Jice trade chats, "selling ci map"')
+
+
+def test_keyed_per_speaker_and_filter(configs):
+    cooldown, _clock = make_cooldown(configs)
+    assert alert(cooldown, '[19:20:11] Jice trade chats, "selling ci map"')
+    assert alert(cooldown, '[19:20:12] Bob trade chats, "selling ci map"')
+    assert alert(cooldown, '[19:20:13] Jice trade chats, "selling ci map"', key=2)
+    assert alert(cooldown, '[19:20:14] Jice trade chats, "selling reliq"')
+    assert not alert(cooldown, '[19:20:15] Jice trade chats, "selling ci map"')
+    assert not alert(cooldown, '[19:20:16] Bob trade chats, "selling ci map"')
+
+
+def test_window_of_zero_always_alerts(configs):
+    cooldown, _clock = make_cooldown(configs, window=0)
+    for _ in range(3):
+        assert alert(cooldown, '[19:20:11] Jice trade chats, "selling ci map"')
+    assert len(cooldown) == 0
+
+
+def test_expired_entries_are_dropped(configs):
+    cooldown, clock = make_cooldown(configs, window=10)
+    alert(cooldown, '[19:20:11] Jice trade chats, "selling ci map"')
+    clock.advance_to(5)
+    alert(cooldown, '[19:20:16] Bob trade chats, "selling ci map"')
+    clock.advance_to(12)
+    alert(cooldown, '[19:20:23] Al trade chats, "selling ci map"')
+    assert len(cooldown) == 2 # Jice's has expired
+
+
+def test_oldest_alert_is_dropped_when_full(configs):
+    cooldown, clock = make_cooldown(configs, window=600, max_entries=2)
+    for second, speaker in enumerate(["Jice", "Bob", "Al"]):
+        clock.advance_to(second)
+        alert(cooldown, F'[19:20:11] {speaker} trade chats, "selling ci map"')
+    assert len(cooldown) == 2
+    assert alert(cooldown, '[19:20:11] Jice trade chats, "selling ci map"')
+    assert not alert(cooldown, '[19:20:11] Al trade chats, "selling ci map"')
+
+
+def test_normalize_message():
+    assert normalize_message('Selling CI map!!') == normalize_message("selling   ci-map") == "selling ci map"
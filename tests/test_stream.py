@@ -0,0 +1,89 @@
+import gzip
+import itertools
+import threading
+import time
+
+import pytest
+
+from thalassa_core.chat_line import ChatLine
+from thalassa_core.configs import SearchEntry
+from thalassa_core.events import FilterMatchEvent, GameEvent
+from thalassa_core.stream import Stream, _IDLE, iter_events
+
+CHATLOG_NAME = "Jice_emerald_chat_log_2025-11-25.txt"
+LOG_NAME = "yohoho_1764097495517.log"
+FORAGE = "2025/11/25 19:20:11:789 INFO ak.doLog: Stopping foraging in 119 seconds"
+
+
+def chat(number: int) -> str:
+    return F'[19:20:{number:02}] Jice global chats, "ci map #{number}"'
+
+
+@pytest.fixture
+def configs(configs):
+    configs.search_strings = {1: SearchEntry(name="Maps", channel="global", strings="ci map")}
+    return configs
+
+
+def test_stages():
+    assert list(Stream(range(10)).filter(lambda n: n % 2 == 0).map(lambda n: n * 10)) == [0, 20, 40, 60, 80]
+    assert list(Stream(range(6)).window(3, step=2)) == [(0, 1, 2), (2, 3, 4)]
+    assert list(Stream(range(10)).batch(4)) == [[0, 1, 2, 3], [4, 5, 6, 7], [8, 9]]
+    assert list(Stream([1, "a", 2.0, "b"]).of_type(str)) == ["a", "b"]
+
+
+def test_stages_are_lazy():
+    # An endless input only gets read as far as is needed
+    assert list(Stream(itertools.count()).map(lambda n: n * 2).batch(2).take(2)) == [[0, 2], [4, 6]]
+
+
+def test_idle_hands_over_a_short_batch_but_never_reaches_the_consumer():
+    assert list(Stream([1, 2, _IDLE, 3]).map(lambda n: n + 1).batch(10)) == [[2, 3], [4]]
+
+
+def test_reads_logs_and_chatlogs(tmp_path, configs):
+    (tmp_path / CHATLOG_NAME).write_text(chat(1) + "\n" + chat(2) + "\n")
+    (tmp_path / LOG_NAME).write_text("2025/11/25 19:20:11:000 INFO ak.doLog: Nothing\n" + FORAGE + "\n")
+    with gzip.open(tmp_path / "Jice_emerald_chat_log_2025-11-24.txt.gz", "wt") as fh:
+        fh.write(chat(0) + "\n")
+
+    items = list(iter_events([tmp_path], configs, follow=False))
+    lines = [item.line for item in items if isinstance(item, ChatLine)]
+    assert lines == [chat(0), chat(1), chat(2)] # Oldest name first
+    for index, item in enumerate(items):
+        if isinstance(item, FilterMatchEvent):
+            assert items[index - 1].line == item.line # Each match straight after its line
+    assert len([item for item in items if isinstance(item, FilterMatchEvent)]) == 3
+    assert [item.line for item in items if isinstance(item, GameEvent)] == [FORAGE]
+
+
+class Next():
+    """next(iterator) on another thread, so the test can write to the files while the stream waits
+    and fails instead of hanging if nothing turns up."""
+    def __init__(self, iterator) -> None:
+        self.result = []
+        self.thread = threading.Thread(target=lambda: self.result.append(next(iterator)), daemon=True)
+        self.thread.start()
+        time.sleep(0.2) # Long enough for the stream to have looked at the directory
+
+    def get(self, seconds: float = 5.0):
+        self.thread.join(seconds)
+        assert self.result, F"nothing arrived within {seconds}s"
+        return self.result[0]
+
+
+def test_follow_picks_up_new_lines_and_new_files(tmp_path, configs):
+    chatlog = tmp_path / CHATLOG_NAME
+    chatlog.write_text(chat(1) + "\n")
+    matches = iter(iter_events([tmp_path], configs, from_start=False, poll_interval=0.05).of_type(FilterMatchEvent))
+
+    waiting = Next(matches)
+    with chatlog.open("a") as fh:
+        fh.write(chat(2) + "\n")
+    assert waiting.get().line == chat(2) # chat(1) was there before it started
+
+    waiting = Next(matches)
+    newer = tmp_path / "Jice_emerald_chat_log_2025-11-26.txt"
+    newer.write_text(chat(3) + "\n") # Created after the start, read in full
+    assert waiting.get().line == chat(3)
+    matches.close()
@@ -0,0 +1,56 @@
+import pytest
+
+from thalassa_core.configs import SearchEntry
+from thalassa_core.trade_tokenizer import TradeTokenizer
+
+BUY_STRINGS = ["buy", "[b]", "wtb", "lf", "looking"]
+SELL_STRINGS = ["sell", "[s]", "wts", "free", "giving"]
+
+
+@pytest.mark.parametrize("message, buy_spans, sell_spans", [
+    ("buying reliq selling ci map", [(0, 12)], [(13, 27)]),
+    ("selling ci map, cursed isles map", [], [(0, 32)]),
+    ("wtb ci map", [(0, 10)], []),
+    ("[s] vamp charm [b] reliq", [(15, 24)], [(0, 14)]),
+    ("SELLING CI MAP wtb gold", [(15, 23)], [(0, 14)]),
+    ("selling ci map   ", [], [(0, 14)]), # Trailing spaces are left out
+    ("hello there", [], []),
+    ("", [], []),
+])
+def test_spans(message, buy_spans, sell_spans):
+    tokenizer = TradeTokenizer(BUY_STRINGS, SELL_STRINGS)
+    assert tokenizer.spans(message) == (buy_spans, sell_spans)
+    assert tokenizer.split(message) == ([message[start:end] for start, end in buy_spans],
+                                        [message[start:end] for start, end in sell_spans])
+
+
+def test_no_keywords():
+    assert TradeTokenizer([], []).spans("buying ci map") == ([], [])
+
+
+@pytest.fixture
+def configs(configs):
+    configs.search_strings = {
+        1: SearchEntry(name="Buying CI Map", channel="trade", buy_or_sell="Buy", strings="ci map|cursed isles map"),
+        2: SearchEntry(name="Selling Reliq", channel="trade", buy_or_sell="Sell", strings="reliq"),
+    }
+    return configs
+
+
+@pytest.mark.parametrize("line, expected", [
+    # A buy filter searches the sell parts of a message and the other way round
+    ('[19:20:11] Jice trade chats, "buying reliq selling ci map"', {
+        1: (["ci map"], ["ci map"]),
+        2: (["reliq"], ["reliq"]),
+    }),
+    ('[19:20:11] Jice trade chats, "selling ci map, cursed isles map"', {
+        1: (["ci map", "cursed isles map"], ["ci map", "cursed isles map"]),
+    }),
+    ('[19:20:11] Jice trade chats, "buying ci map selling reliq"', {}),
+    # A keyword in the speaker's name doesn't count
+    ('[19:20:11] Sellingci trade chats, "lf ci map"', {}),
+])
+def test_trade_filter_matches(parser, events, line, expected):
+    parser.apply_custom_chatlog_filters(line)
+    found = {event.key: (event.matches, [line[start:end] for start, end in event.spans]) for event in events}
+    assert found == expected